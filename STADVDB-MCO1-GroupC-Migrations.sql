@@ -0,0 +1,41 @@
+-- Upgrades for a country_data_warehouse created from an earlier revision of
+-- STADVDB-MCO1-GroupC-Schema.sql. Run the sections newer than your schema,
+-- then reload with `python -m etl`.
+USE country_data_warehouse;
+
+-- Region dimension
+CREATE TABLE dim_region (
+    region_key INT PRIMARY KEY,
+    region_name VARCHAR(30)
+);
+ALTER TABLE dim_country
+    ADD COLUMN region_key INT,
+    ADD INDEX idx_country_region (region_key),
+    ADD FOREIGN KEY (region_key) REFERENCES dim_region(region_key);
+
+-- Secondary / covering indexes and fact partitioning
+ALTER TABLE dim_country ADD INDEX idx_country_name (country_name);
+ALTER TABLE dim_time ADD INDEX idx_time_year (year_value, time_key);
+ALTER TABLE dim_quality_of_life
+    ADD INDEX idx_qol_traffic_category (traffic_commute_category),
+    ADD INDEX idx_qol_cost_category (cost_of_living_category),
+    ADD INDEX idx_qol_climate_category (climate_category),
+    ADD INDEX idx_qol_quality_category (quality_of_life_category);
+-- Partitioned tables cannot have foreign keys; these are MySQL's default
+-- names, check SHOW CREATE TABLE fact_country_metrics if yours differ.
+ALTER TABLE fact_country_metrics
+    DROP FOREIGN KEY fact_country_metrics_ibfk_1,
+    DROP FOREIGN KEY fact_country_metrics_ibfk_2;
+ALTER TABLE fact_country_metrics
+    DROP INDEX time_key,
+    ADD INDEX idx_fact_time_covering (time_key, gdp_usd, population, gdp_per_capita);
+ALTER TABLE fact_country_metrics
+PARTITION BY RANGE (time_key) (
+    PARTITION p_pre1980 VALUES LESS THAN (1980),
+    PARTITION p1980s VALUES LESS THAN (1990),
+    PARTITION p1990s VALUES LESS THAN (2000),
+    PARTITION p2000s VALUES LESS THAN (2010),
+    PARTITION p2010s VALUES LESS THAN (2020),
+    PARTITION p2020s VALUES LESS THAN (2030),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
@@ -1,15 +1,24 @@
 CREATE DATABASE country_data_warehouse;
 USE country_data_warehouse;
+CREATE TABLE dim_region (
+    region_key INT PRIMARY KEY,
+    region_name VARCHAR(30)
+);
 CREATE TABLE dim_country (
     country_key INT AUTO_INCREMENT PRIMARY KEY,
     country_name VARCHAR(100),
-    country_code VARCHAR(3)
+    country_code VARCHAR(3),
+    region_key INT,
+    INDEX idx_country_region (region_key),
+    INDEX idx_country_name (country_name),
+    FOREIGN KEY (region_key) REFERENCES dim_region(region_key)
 );
 CREATE TABLE dim_time (
     time_key INT PRIMARY KEY,
     year_value INT,
     is_historical BOOLEAN,
-    period_type VARCHAR(20)
+    period_type VARCHAR(20),
+    INDEX idx_time_year (year_value, time_key)
 );
 CREATE TABLE dim_quality_of_life (
     country_key INT PRIMARY KEY,
@@ -34,7 +43,10 @@ CREATE TABLE dim_quality_of_life (
     pollution_category VARCHAR(20),
     quality_of_life_category VARCHAR(20),
     
-    
+    INDEX idx_qol_traffic_category (traffic_commute_category),
+    INDEX idx_qol_cost_category (cost_of_living_category),
+    INDEX idx_qol_climate_category (climate_category),
+    INDEX idx_qol_quality_category (quality_of_life_category),
     FOREIGN KEY (country_key) REFERENCES dim_country(country_key)
 );
 CREATE TABLE fact_country_metrics (
@@ -46,6 +58,30 @@ CREATE TABLE fact_country_metrics (
     gdp_per_capita DECIMAL(10,2),
     
     PRIMARY KEY (country_key, time_key),
-    FOREIGN KEY (country_key) REFERENCES dim_country(country_key),
-    FOREIGN KEY (time_key) REFERENCES dim_time(time_key)
+    -- time_key-leading and covering (InnoDB appends country_key): serves
+    -- the latest-year lookup and year slices without touching the rows
+    INDEX idx_fact_time_covering (time_key, gdp_usd, population, gdp_per_capita)
+)
+-- time_key is the calendar year. Partitioned InnoDB tables cannot have
+-- foreign keys, so key integrity is left to the ETL.
+PARTITION BY RANGE (time_key) (
+    PARTITION p_pre1980 VALUES LESS THAN (1980),
+    PARTITION p1980s VALUES LESS THAN (1990),
+    PARTITION p1990s VALUES LESS THAN (2000),
+    PARTITION p2000s VALUES LESS THAN (2010),
+    PARTITION p2010s VALUES LESS THAN (2020),
+    PARTITION p2020s VALUES LESS THAN (2030),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
+CREATE TABLE etl_source_files (
+    source_name VARCHAR(50) PRIMARY KEY,
+    file_name VARCHAR(255),
+    sha256 CHAR(64),
+    loaded_at DATETIME
+);
+CREATE TABLE etl_load_version (
+    version_id TINYINT PRIMARY KEY,
+    load_version BIGINT NOT NULL,
+    loaded_at DATETIME,
+    load_token CHAR(32)
 );
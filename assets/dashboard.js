@@ -0,0 +1,85 @@
+// Clientside callbacks for dashboard.py. The stores hold each chart's data
+// for every country, built on the server; these functions cut it down to the
+// dropdown selection in the browser, mirroring cost_living_figure and
+// climate_heatmap_figure, and draw their placeholders.
+
+// Plotly serializes NumPy arrays as {dtype, bdata: base64}; plain lists pass through
+const TYPED_ARRAYS = {
+    i1: Int8Array, u1: Uint8Array, i2: Int16Array, u2: Uint16Array,
+    i4: Int32Array, u4: Uint32Array, f4: Float32Array, f8: Float64Array,
+};
+
+function decodeArray(value) {
+    if (!value || Array.isArray(value) || !value.bdata) {
+        return value;
+    }
+    const bytes = Uint8Array.from(atob(value.bdata), (c) => c.charCodeAt(0));
+    return Array.from(new TYPED_ARRAYS[value.dtype](bytes.buffer));
+}
+
+// The px.bar(title=...) and px.imshow([[0]], title=...) placeholders, on the
+// chart's Plotly template
+function barPlaceholder(template, title) {
+    return {data: [], layout: {template: template, title: {text: title}}};
+}
+
+function heatmapPlaceholder(template, title) {
+    return {
+        data: [{type: 'heatmap', z: [[0]], coloraxis: 'coloraxis',
+                hovertemplate: 'x: %{x}<br>y: %{y}<br>color: %{z}<extra></extra>'}],
+        layout: {
+            template: template,
+            title: {text: title},
+            xaxis: {scaleanchor: 'y', constrain: 'domain'},
+            yaxis: {autorange: 'reversed', constrain: 'domain'},
+        },
+    };
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    dashboard: {
+        filterCostLiving: function (selected, store) {
+            if (!store) {
+                return window.dash_clientside.no_update;
+            }
+            if (!selected || !selected.length) {
+                return barPlaceholder(store.figure.layout.template, 'Please select countries to display');
+            }
+            const keep = new Set(selected);
+            const data = store.figure.data.map((trace) => {
+                const x = decodeArray(trace.x);
+                const y = decodeArray(trace.y);
+                const rows = x.map((_, i) => i).filter((i) => keep.has(x[i]));
+                return Object.assign({}, trace, {x: rows.map((i) => x[i]), y: rows.map((i) => y[i])});
+            }).filter((trace) => trace.x.length);  // px.bar has no traces for no rows
+            return Object.assign({}, store.figure, {data: data});
+        },
+
+        filterClimateHeatmap: function (selected, store) {
+            if (!store) {
+                return window.dash_clientside.no_update;
+            }
+            if (!selected || !selected.length) {
+                return heatmapPlaceholder(store.layout.template, 'Please select countries to display');
+            }
+            // Selected rows in name order, then only the rows and years with a value
+            const keep = new Set(selected);
+            let rows = store.countries.map((_, i) => i).filter((i) => keep.has(store.countries[i]));
+            rows = rows.filter((i) => store.values[i].some((v) => v !== null));
+            const columns = store.years.map((_, j) => j).filter((j) => rows.some((i) => store.values[i][j] !== null));
+            if (!rows.length || !columns.length) {
+                return heatmapPlaceholder(store.layout.template, 'No data available for selected countries');
+            }
+
+            const z = rows.map((i) => columns.map((j) => store.values[i][j] === null ? 0 : store.values[i][j]));
+            const trace = Object.assign({}, store.trace, {
+                x: columns.map((j) => store.years[j]),
+                y: rows.map((i) => store.countries[i]),
+                z: z,
+                text: z.map((row) => row.map((v) => Math.round(v * 100) / 100)),
+            });
+            const layout = Object.assign({}, store.layout, {height: Math.max(400, rows.length * 35)});
+            return {data: [trace], layout: layout};
+        },
+    },
+});
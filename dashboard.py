@@ -1,72 +1,50 @@
 import dash
-from dash import dcc, html, Input, Output, callback
+from dash import dcc, html, Input, Output, Patch, callback, clientside_callback, ClientsideFunction, ctx, no_update
 import plotly.express as px
 import plotly.graph_objects as go
 from reports import (
-    gdp_population_correlation_report,
     cost_of_living_vs_purchasing_power_report,
-    climate_quality_vs_economic_development_report,
-    quality_of_life_by_region_report,
-    traffic_commute_category_report 
+    dw_engine
 )
+from dashboard_data import (
+    DASH_WARM_UP, get_climate_matrix, get_frame, get_gdp_pop_points, level_of_detail, start_warm_up
+)
+from figure_cache import cached_figure
+from query_metrics import register_metrics_endpoint
+import os
+import numpy as np
 import pandas as pd
 import random
 
-# --- Get Report Data ---
-gdp_pop_df = gdp_population_correlation_report()
-cost_living_df = cost_of_living_vs_purchasing_power_report()
-climate_gdp_df = climate_quality_vs_economic_development_report()
-quality_region_df = quality_of_life_by_region_report() 
-traffic_commute_df = traffic_commute_category_report() 
-
+# --- Report Data ---
+# No query runs at import: the page renders at once with empty charts and
+# dropdowns, and the callbacks below fill them from the frames in
+# dashboard_data.py (loaded on first use, warmed in the background).
 app = dash.Dash(__name__)
 
-# --- GDP vs Population Scatter Plot ---
-gdp_pop_fig = px.scatter(
-    gdp_pop_df,
-    x="population",
-    y="gdp_usd",
-    color="country_name",
-    hover_name="country_name",
-    size="population",
-    size_max=60,
-    log_x=True,
-    log_y=True,
-    title="GDP vs. Population by Country",
-    labels={
-        "population": "Population (log scale)",
-        "gdp_usd": "GDP in USD (log scale)",
-        "country_name": "Country"
-    }
-)
+# Per-report and per-statement timings in Prometheus' text format at
+# /metrics (see query_metrics.py); enabled with DASH_METRICS=1
+if os.environ.get('DASH_METRICS', '0') != '0':
+    register_metrics_endpoint(app.server)
 
-# --- Prepare Cost of Living vs Purchasing Power ---
-cost_living_clean = cost_living_df.dropna(subset=['country_name', 'avg_cost_of_living', 'avg_purchasing_power'])
-available_countries = sorted(cost_living_clean['country_name'].unique())
-
-random.seed(42)
-default_countries = random.sample(available_countries, min(10, len(available_countries)))
-
-# --- Prepare Climate vs GDP data ---
-climate_gdp_clean = climate_gdp_df.dropna(subset=['country_name', 'total_gdp_usd', 'climate_quality_2025'])
-climate_gdp_clean = climate_gdp_clean[climate_gdp_clean['country_name'].notna()]
-
-# --- Prepare heatmap countries list ---
-available_heatmap_countries = sorted(climate_gdp_clean['country_name'].unique())
-
-# Traffic Commute Category Treemap
-traffic_commute_treemap_fig = px.treemap(
-    traffic_commute_df.sort_values('sort_order'),
-    path=[px.Constant("Traffic Commute Categories"), 'traffic_commute_category'],
-    values='total_population',
-    color='avg_gdp_per_capita',
-    color_continuous_scale='Viridis',
-    title="Traffic Commute Categories: Population and Average GDP Per Capita",
-    hover_data={'total_population': ':,.0f', 'avg_gdp_per_capita': ':,.2f'}
-)
+
+# Figures of the country-selection callbacks, reused across selections in
+# any order and across workers until the next ETL load (figure_cache.py)
+figure_cache = cached_figure(dw_engine)
+
+
+def available_countries():
+    cost_living_clean = get_frame('cost_living').dropna(subset=['country_name'])
+    return sorted(cost_living_clean['country_name'].unique())
+
+def available_heatmap_countries():
+    climate_gdp_clean = get_frame('climate_gdp').dropna(subset=['country_name'])
+    return sorted(climate_gdp_clean['country_name'].unique())
 
 # --- Layout ---
 app.layout = html.Div([
+    # Page loads trigger the callbacks that fill the charts and dropdowns
+    dcc.Location(id='url'),
     html.H1("Country Metrics Dashboard", style={'textAlign': 'center', 'marginBottom': 30}),
 
     html.Div([
@@ -77,10 +55,9 @@ app.layout = html.Div([
     # --- GDP vs Population Section ---
     html.Div([
         html.H2("Economic Analysis"),
-        dcc.Graph(
-            id='gdp-vs-population-scatter',
-            figure=gdp_pop_fig
-        )
+        dcc.Loading(dcc.Graph(
+            id='gdp-vs-population-scatter'
+        ))
     ], style={'marginBottom': 40}),
 
     # --- Cost of Living Section ---
@@ -90,16 +67,15 @@ app.layout = html.Div([
             html.Label("Select Countries:", style={'fontWeight': 'bold', 'marginBottom': 10}),
             dcc.Dropdown(
                 id='country-dropdown',
-                options=[{'label': country, 'value': country} for country in available_countries],
-                value=default_countries,
                 multi=True,
                 placeholder="Select countries to display...",
                 style={'marginBottom': 20}
             )
         ]),
-        dcc.Graph(
+        dcc.Store(id='cost-living-store'),
+        dcc.Loading(dcc.Graph(
             id='cost-living-chart'
-        )
+        ))
     ], style={'marginBottom': 40}),
 
     # --- Climate Quality Heatmap Section ---
@@ -109,58 +85,172 @@ app.layout = html.Div([
             html.Label("Select Countries for Heatmap:", style={'fontWeight': 'bold', 'marginBottom': 10}),
             dcc.Dropdown(
                 id='heatmap-country-dropdown',
-                options=[{'label': country, 'value': country} for country in available_heatmap_countries],
-                value=available_heatmap_countries[:15],
                 multi=True,
                 placeholder="Select countries to display in heatmap...",
                 style={'marginBottom': 20}
             )
         ]),
-        dcc.Graph(
+        dcc.Store(id='climate-heatmap-store'),
+        dcc.Loading(dcc.Graph(
             id='climate-heatmap'
-        )
+        ))
     ], style={'marginBottom': 40}),
 
     # --- ✅ NEW: Quality of Life Index by Region ---
     html.Div([
         html.H2("Quality of Life Index by Region"),
-        dcc.Graph(
-            id='qol-region-bar',
-            figure=px.bar(
-                quality_region_df,
-                x='region',
-                y='avg_quality_of_life_index',
-                title='Average Quality of Life Index by Region',
-                labels={'region': 'Region', 'avg_quality_of_life_index': 'Quality of Life Index'},
-                color='avg_quality_of_life_index',
-                color_continuous_scale='Viridis'
-            )
-        )
+        dcc.Loading(dcc.Graph(
+            id='qol-region-bar'
+        ))
     ], style={'marginBottom': 40}),
 
     # Traffic Commute Category Treemap Section
     html.Div([
         html.H2("Traffic Commute Category Treemap"),
-        dcc.Graph(
-            id='traffic-commute-treemap',
-            figure=traffic_commute_treemap_fig
-        )
+        dcc.Loading(dcc.Graph(
+            id='traffic-commute-treemap'
+        ))
     ], style={'marginBottom': 40})
 ], style={'padding': 20})
 
 # --- Callbacks ---
+# --- GDP vs Population Scatter Plot ---
+# By default the scatter is one WebGL (Scattergl) trace colored per point
+# instead of an SVG trace per country, and holds at most DASH_SCATTER_POINTS
+# points: a zoomed-out view keeps the largest country per grid cell (see
+# dashboard_data.level_of_detail) and each zoom or pan refines the points to
+# the new view. DASH_SCATTER_WEBGL=0 restores the per-country SVG traces.
+DASH_SCATTER_WEBGL = os.environ.get('DASH_SCATTER_WEBGL', '1') != '0'
+DASH_SCATTER_POINTS = int(os.environ.get('DASH_SCATTER_POINTS', '5000'))
+
+def view_ranges(relayout):
+    """(x_range, y_range) in log10 units from a relayoutData event, None for
+    an axis left autoranged; None when the event did not move the view.
+    """
+    ranges = []
+    moved = False
+    for axis in ('xaxis', 'yaxis'):
+        bounds = relayout.get(f'{axis}.range')
+        if bounds is None and f'{axis}.range[0]' in relayout:
+            bounds = [relayout[f'{axis}.range[0]'], relayout.get(f'{axis}.range[1]')]
+        moved = moved or bounds is not None or f'{axis}.autorange' in relayout
+        ranges.append(sorted(bounds) if bounds is not None and None not in bounds else None)
+    return tuple(ranges) if moved else None
+
+def gdp_pop_points(rows):
+    """Trace columns of the GDP vs population points at row numbers rows."""
+    points = get_gdp_pop_points()
+    return {
+        'x': points['x'][rows].tolist(),
+        'y': points['y'][rows].tolist(),
+        'hovertext': points['name'][rows].tolist(),
+        'color': points['color'][rows].tolist(),
+        'size': points['x'][rows].tolist(),
+    }
+
+def gdp_pop_webgl_figure():
+    points = get_gdp_pop_points()
+    trace = gdp_pop_points(level_of_detail(points, DASH_SCATTER_POINTS))
+    fig = go.Figure(go.Scattergl(
+        x=trace['x'],
+        y=trace['y'],
+        mode='markers',
+        hovertext=trace['hovertext'],
+        hovertemplate="<b>%{hovertext}</b><br><br>Population (log scale)=%{x}<br>"
+                      "GDP in USD (log scale)=%{y}<extra></extra>",
+        marker={'color': trace['color'], 'size': trace['size'], 'sizemode': 'area',
+                'sizeref': points['sizeref'], 'sizemin': 1}
+    ))
+    fig.update_layout(
+        title="GDP vs. Population by Country",
+        xaxis={'type': 'log', 'title': "Population (log scale)"},
+        yaxis={'type': 'log', 'title': "GDP in USD (log scale)"},
+        # Keeps the zoom when refined points are patched in
+        uirevision='gdp-vs-population'
+    )
+    return fig
+
 @callback(
-    Output('cost-living-chart', 'figure'),
-    Input('country-dropdown', 'value')
+    Output('gdp-vs-population-scatter', 'figure'),
+    Input('url', 'pathname'),
+    Input('gdp-vs-population-scatter', 'relayoutData')
+)
+def update_gdp_pop_chart(_, relayout):
+    if ctx.triggered_id == 'gdp-vs-population-scatter':
+        ranges = view_ranges(relayout or {})
+        # Every point is already drawn when they fit the budget
+        if not DASH_SCATTER_WEBGL or ranges is None or len(get_gdp_pop_points()['x']) <= DASH_SCATTER_POINTS:
+            return no_update
+        trace = gdp_pop_points(level_of_detail(get_gdp_pop_points(), DASH_SCATTER_POINTS, *ranges))
+        patched = Patch()
+        patched['data'][0]['x'] = trace['x']
+        patched['data'][0]['y'] = trace['y']
+        patched['data'][0]['hovertext'] = trace['hovertext']
+        patched['data'][0]['marker']['color'] = trace['color']
+        patched['data'][0]['marker']['size'] = trace['size']
+        return patched
+
+    if DASH_SCATTER_WEBGL:
+        return gdp_pop_webgl_figure()
+    return px.scatter(
+        get_frame('gdp_pop'),
+        x="population",
+        y="gdp_usd",
+        color="country_name",
+        hover_name="country_name",
+        size="population",
+        size_max=60,
+        log_x=True,
+        log_y=True,
+        title="GDP vs. Population by Country",
+        labels={
+            "population": "Population (log scale)",
+            "gdp_usd": "GDP in USD (log scale)",
+            "country_name": "Country"
+        }
+    )
+
+
+# --- Country dropdowns ---
+@callback(
+    Output('country-dropdown', 'options'),
+    Output('country-dropdown', 'value'),
+    Input('url', 'pathname')
+)
+def load_country_dropdown(_):
+    countries = available_countries()
+    default_countries = random.Random(42).sample(countries, min(10, len(countries)))
+    return [{'label': country, 'value': country} for country in countries], default_countries
+
+
+@callback(
+    Output('heatmap-country-dropdown', 'options'),
+    Output('heatmap-country-dropdown', 'value'),
+    Input('url', 'pathname')
 )
-def update_cost_living_chart(selected_countries):
-    if not selected_countries:
+def load_heatmap_country_dropdown(_):
+    countries = available_heatmap_countries()
+    return [{'label': country, 'value': country} for country in countries], countries[:15]
+
+
+# --- Cost of Living and Climate Heatmap figures ---
+# Both charts are filtered in the browser: each page load gets the data for
+# every country in a dcc.Store, and the clientside callbacks in
+# assets/dashboard.js cut it down to the dropdown selection (and draw the
+# placeholders), so dropdown changes cost no server round trip. The all-country figures are
+# built once per load version (figure_cache.py); a selection of None stands
+# for every country and reads the reports unfiltered.
+@figure_cache
+def cost_living_figure(selected_countries):
+    if selected_countries is not None and not selected_countries:
         fig = px.bar(title="Please select countries to display")
         return fig
 
-    filtered_df = cost_living_clean[cost_living_clean['country_name'].isin(selected_countries)]
+    filtered_df = cost_of_living_vs_purchasing_power_report(
+        countries=selected_countries, columns=['avg_cost_of_living', 'avg_purchasing_power']
+    ).dropna(subset=['country_name', 'avg_cost_of_living', 'avg_purchasing_power'])
 
-    total_countries_with_data = len(available_countries)
+    total_countries_with_data = len(available_countries())
     chart_title = f"Average Cost of Living vs Purchasing Power by Country<br><sub>Data available for {total_countries_with_data} countries</sub>"
 
     fig = px.bar(
@@ -189,37 +279,36 @@ def update_cost_living_chart(selected_countries):
     return fig
 
 
-@callback(
-    Output('climate-heatmap', 'figure'),
-    Input('heatmap-country-dropdown', 'value')
-)
-def update_climate_heatmap(selected_countries):
-    if not selected_countries:
+@figure_cache
+def climate_heatmap_figure(selected_countries):
+    if selected_countries is not None and not selected_countries:
         fig = px.imshow([[0]], title="Please select countries to display")
         return fig
 
-    filtered_df = climate_gdp_clean[climate_gdp_clean['country_name'].isin(selected_countries)]
-
-    if filtered_df.empty:
-        fig = px.imshow([[0]], title="No data available for selected countries")
-        return fig
-
-    heatmap_data = filtered_df.pivot_table(
-        values='development_efficiency_ratio',
-        index='country_name',
-        columns='year_value',
-        aggfunc='mean'
-    ).fillna(0)
-
-    if heatmap_data.empty:
+    # Rows of the selected countries (in name order) from the precomputed
+    # matrix; years and countries without any value are left out
+    matrix, countries, years, row_of = get_climate_matrix()
+    if selected_countries is None:
+        rows = np.arange(len(countries), dtype=np.intp)
+    else:
+        rows = np.sort(np.array([row_of[c] for c in set(selected_countries) if c in row_of], dtype=np.intp))
+    heatmap_values = matrix[rows]
+    has_value = ~np.isnan(heatmap_values)
+    row_mask = has_value.any(axis=1)
+    col_mask = has_value.any(axis=0)
+    heatmap_values = np.nan_to_num(heatmap_values[row_mask][:, col_mask])
+    heatmap_countries = countries[rows[row_mask]]
+    heatmap_years = years[col_mask]
+
+    if heatmap_values.size == 0:
         fig = px.imshow([[0]], title="No data available for selected countries")
         return fig
 
     fig = px.imshow(
-        heatmap_data.values,
+        heatmap_values,
         labels=dict(x="Year", y="Country", color="Development Efficiency Ratio"),
-        x=heatmap_data.columns,
-        y=heatmap_data.index,
+        x=heatmap_years,
+        y=heatmap_countries,
         title="Climate Quality vs Economic Development Efficiency (2020-2025)<br><sub>Higher values indicate better economic efficiency relative to climate quality</sub>",
         color_continuous_scale="RdYlGn",
         aspect="auto"
@@ -228,14 +317,14 @@ def update_climate_heatmap(selected_countries):
     fig.update_layout(
         xaxis_title="Year",
         yaxis_title="Country",
-        height=max(400, len(heatmap_data.index) * 35),
+        height=max(400, len(heatmap_countries) * 35),
         coloraxis_colorbar=dict(
             title="Development Efficiency Ratio"
         )
     )
 
     fig.update_traces(
-        text=heatmap_data.round(2).values,
+        text=heatmap_values.round(2),
         texttemplate="%{text}",
         textfont={"size": 10},
         hovertemplate="<b>%{y}</b><br>Year: %{x}<br>Efficiency Ratio: %{z:.2f}<extra></extra>"
@@ -244,5 +333,84 @@ def update_climate_heatmap(selected_countries):
     return fig
 
 
+@callback(
+    Output('cost-living-store', 'data'),
+    Input('url', 'pathname')
+)
+def load_cost_living_store(_):
+    return {'figure': cost_living_figure(None)}
+
+
+@callback(
+    Output('climate-heatmap-store', 'data'),
+    Input('url', 'pathname')
+)
+def load_climate_heatmap_store(_):
+    # The matrix goes once (NaN as null), with the figure's trace and layout
+    # stripped of their data as the template the browser fills in
+    matrix, countries, years, _ = get_climate_matrix()
+    figure = climate_heatmap_figure(None)
+    return {
+        'trace': {k: v for k, v in figure['data'][0].items() if k not in ('x', 'y', 'z', 'text')},
+        'layout': {k: v for k, v in figure['layout'].items() if k != 'height'},
+        'countries': countries.tolist(),
+        'years': years.tolist(),
+        'values': np.where(np.isnan(matrix), None, matrix).tolist(),
+    }
+
+
+clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='filterCostLiving'),
+    Output('cost-living-chart', 'figure'),
+    Input('country-dropdown', 'value'),
+    Input('cost-living-store', 'data')
+)
+
+clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='filterClimateHeatmap'),
+    Output('climate-heatmap', 'figure'),
+    Input('heatmap-country-dropdown', 'value'),
+    Input('climate-heatmap-store', 'data')
+)
+
+
+# --- Quality of Life Index by Region ---
+@callback(
+    Output('qol-region-bar', 'figure'),
+    Input('url', 'pathname')
+)
+def update_qol_region_chart(_):
+    return px.bar(
+        get_frame('quality_region'),
+        x='region',
+        y='avg_quality_of_life_index',
+        title='Average Quality of Life Index by Region',
+        labels={'region': 'Region', 'avg_quality_of_life_index': 'Quality of Life Index'},
+        color='avg_quality_of_life_index',
+        color_continuous_scale='Viridis'
+    )
+
+
+# --- Traffic Commute Category Treemap ---
+@callback(
+    Output('traffic-commute-treemap', 'figure'),
+    Input('url', 'pathname')
+)
+def update_traffic_commute_treemap(_):
+    return px.treemap(
+        get_frame('traffic_commute').sort_values('sort_order'),
+        path=[px.Constant("Traffic Commute Categories"), 'traffic_commute_category'],
+        values='total_population',
+        color='avg_gdp_per_capita',
+        color_continuous_scale='Viridis',
+        title="Traffic Commute Categories: Population and Average GDP Per Capita",
+        hover_data={'total_population': ':,.0f', 'avg_gdp_per_capita': ':,.2f'}
+    )
+
+
+# Warm the report frames while the server starts listening
+if DASH_WARM_UP:
+    start_warm_up()
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,150 @@
+import os
+import threading
+
+import numpy as np
+import plotly.express as px
+
+from reports import (
+    gdp_population_correlation_report,
+    cost_of_living_vs_purchasing_power_report,
+    climate_quality_vs_economic_development_report,
+    quality_of_life_by_region_report,
+    traffic_commute_category_report,
+    run_reports_concurrently,
+    dw_engine
+)
+from report_cache import load_version
+
+# --- Dashboard data provider ---
+# The report frames behind the dashboard's charts and dropdowns. Nothing is
+# queried at import: each frame is loaded by the first callback that needs
+# it (concurrent callers wait for that one load) and then kept until the
+# warehouse load version changes, so figures cached per load version
+# (figure_cache.py) are never built from an older load. A background thread
+# warms all of them once the app is up; set DASH_WARM_UP=0 to skip it.
+DASH_WARM_UP = os.environ.get('DASH_WARM_UP', '1') != '0'
+
+# The cost of living chart fetches its slice in the callback, so only the
+# country list (no measures) is kept for its dropdown; the heatmap is cut
+# from the climate matrix below
+DASHBOARD_REPORTS = {
+    'gdp_pop': (gdp_population_correlation_report, {}),
+    'cost_living': (cost_of_living_vs_purchasing_power_report, {'columns': []}),
+    'climate_gdp': (climate_quality_vs_economic_development_report, {'columns': ['development_efficiency_ratio']}),
+    'quality_region': (quality_of_life_by_region_report, {}),
+    'traffic_commute': (traffic_commute_category_report, {}),
+}
+
+_frames = {}  # name -> (load version, frame or derived arrays)
+_locks = {name: threading.Lock() for name in [*DASHBOARD_REPORTS, 'climate_matrix', 'gdp_pop_points']}
+
+
+def _load_once(name, load):
+    version = load_version(dw_engine)
+    entry = _frames.get(name)
+    if entry is None or entry[0] != version:
+        with _locks[name]:
+            entry = _frames.get(name)
+            if entry is None or entry[0] != version:
+                entry = _frames[name] = (version, load())
+    return entry[1]
+
+def get_frame(name):
+    """The DataFrame of dashboard report name, loaded on first use and
+    again after each ETL load.
+    """
+    report, kwargs = DASHBOARD_REPORTS[name]
+    return _load_once(name, lambda: report(**kwargs))
+
+def country_year_matrix(df, value):
+    """Dense countries x years array of df[value] (NaN where there is no
+    row), with the sorted country names and years that label its axes and a
+    country -> row number index.
+    """
+    df = df.dropna(subset=['country_name', 'year_value'])
+    countries, country_codes = np.unique(df['country_name'].to_numpy(), return_inverse=True)
+    years, year_codes = np.unique(df['year_value'].to_numpy(dtype='int64'), return_inverse=True)
+    matrix = np.full((len(countries), len(years)), np.nan)
+    matrix[country_codes, year_codes] = df[value].to_numpy(dtype='float64', na_value=np.nan)
+    return matrix, countries, years, {country: row for row, country in enumerate(countries)}
+
+def get_climate_matrix():
+    """(matrix, countries, years, row_of) of the development efficiency ratio."""
+    return _load_once('climate_matrix', lambda: country_year_matrix(get_frame('climate_gdp'),
+                                                                    'development_efficiency_ratio'))
+
+def scatter_points(df, x, y, name, size_max=60):
+    """Column arrays for a single-trace log-log scatter of df: x, y, their
+    log10 (NaN where not positive, as a log axis cannot show them), one
+    color per name (the px palette, in order of appearance) and px's marker
+    sizeref for sizing by x.
+    """
+    names = df[name].to_numpy(dtype=object)
+    _, first_seen, codes = np.unique(names, return_index=True, return_inverse=True)
+    palette = np.array(px.colors.qualitative.Plotly, dtype=object)
+    # rank of each name by first appearance, cycled through the palette
+    appearance = np.argsort(np.argsort(first_seen))
+    points = {
+        'x': df[x].to_numpy(dtype='float64', na_value=np.nan),
+        'y': df[y].to_numpy(dtype='float64', na_value=np.nan),
+        'name': names,
+        'color': palette[appearance[codes] % len(palette)],
+    }
+    with np.errstate(divide='ignore', invalid='ignore'):
+        points['log_x'] = np.where(points['x'] > 0, np.log10(points['x']), np.nan)
+        points['log_y'] = np.where(points['y'] > 0, np.log10(points['y']), np.nan)
+    points['sizeref'] = np.nanmax(points['x'], initial=1) / size_max ** 2
+    return points
+
+def level_of_detail(points, budget, x_range=None, y_range=None):
+    """Row numbers of at most budget points inside the (log10) view ranges.
+
+    When the view holds more, it is cut into a grid of about budget cells
+    and only the largest point of each cell is kept, so clusters thin out
+    while outliers and the overall shape stay.
+    """
+    log_x, log_y = points['log_x'], points['log_y']
+    visible = ~(np.isnan(log_x) | np.isnan(log_y))
+    if x_range is not None:
+        visible &= (log_x >= x_range[0]) & (log_x <= x_range[1])
+    if y_range is not None:
+        visible &= (log_y >= y_range[0]) & (log_y <= y_range[1])
+    rows = np.flatnonzero(visible)
+    if len(rows) <= budget:
+        return rows
+
+    cells = max(1, int(np.sqrt(budget)))
+    x0, x1 = x_range if x_range is not None else (log_x[rows].min(), log_x[rows].max())
+    y0, y1 = y_range if y_range is not None else (log_y[rows].min(), log_y[rows].max())
+    cell_x = np.clip(((log_x[rows] - x0) / ((x1 - x0) or 1) * cells).astype(int), 0, cells - 1)
+    cell_y = np.clip(((log_y[rows] - y0) / ((y1 - y0) or 1) * cells).astype(int), 0, cells - 1)
+    largest_first = np.argsort(-points['x'][rows], kind='stable')
+    _, keep = np.unique((cell_x * cells + cell_y)[largest_first], return_index=True)
+    return np.sort(rows[largest_first[keep]])
+
+def get_gdp_pop_points():
+    """scatter_points() of the GDP vs population report."""
+    return _load_once('gdp_pop_points', lambda: scatter_points(get_frame('gdp_pop'), 'population', 'gdp_usd',
+                                                               'country_name'))
+
+def warm_up():
+    """Load every dashboard report, in parallel, and build the climate matrix
+    and scatter points.
+    """
+    run_reports_concurrently({name: (get_frame, {'name': name}) for name in DASHBOARD_REPORTS})
+    get_climate_matrix()
+    get_gdp_pop_points()
+
+def start_warm_up():
+    """Warm the reports on a background thread; callbacks that arrive first
+    load what they need themselves.
+    """
+    def run():
+        try:
+            warm_up()
+        except Exception as e:
+            print(f"WARNING: dashboard warm-up failed ({e}); reports load on first use")
+
+    thread = threading.Thread(target=run, name='dashboard-warm-up', daemon=True)
+    thread.start()
+    return thread
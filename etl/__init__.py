@@ -0,0 +1,10 @@
+from .countries import name_map, normalize_country, normalize_countries, unmapped_countries
+from .extract import clear_cache, extract, extract_sources
+from .load import bulk_load, load
+from .pipeline import STAGES, run_pipeline
+from .regions import COUNTRY_REGIONS, REGIONS, build_dim_region
+from .schema import create_schema
+from .summaries import SUMMARY_TABLES, refresh_summaries
+from .transform import (
+    build_dim_country, build_dim_quality_of_life, build_dim_time, build_fact, normalize,
+)
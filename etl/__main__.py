@@ -0,0 +1,75 @@
+import argparse
+
+from .config import (
+    CACHE_DIR, DW_URL, INGEST_EXECUTOR, LOAD_CHUNKSIZE, LOAD_METHOD, REFRESH_MODE,
+    REFRESH_SUMMARIES, SOURCE_DB_URL, SOURCE_FILES, STAGE_SOURCES, YEARS, parse_years,
+)
+from .extract import clear_cache
+from .load import BULK_LOADERS
+from .pipeline import STAGES, resolve_stages, run_pipeline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m etl',
+        description='Load the country data warehouse from the Quality of Life, GDP and population sources.'
+    )
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"comma-separated stages to run; dependencies are added automatically "
+                             f"(default: all of {', '.join(STAGES)})")
+    parser.add_argument('--quality-csv', action='append', help='Quality of Life CSV (repeatable)')
+    parser.add_argument('--gdp-xlsx', action='append', help='GDP workbook (repeatable)')
+    parser.add_argument('--population-xml', action='append', help='World Bank population XML (repeatable)')
+    parser.add_argument('--years', metavar='FIRST-LAST',
+                        help="population years to load, e.g. 2000-2020 or 2000- (default: ETL_YEARS, else all)")
+    parser.add_argument('--source-db-url', default=SOURCE_DB_URL, help='staging database URL')
+    parser.add_argument('--dw-url', default=DW_URL, help='data warehouse URL')
+    parser.add_argument('--refresh-mode', choices=['full', 'incremental'], default=REFRESH_MODE)
+    parser.add_argument('--load-method', choices=list(BULK_LOADERS), default=LOAD_METHOD)
+    parser.add_argument('--chunksize', type=int, default=LOAD_CHUNKSIZE, help='rows per load round-trip')
+    parser.add_argument('--executor', choices=['process', 'thread'], default=INGEST_EXECUTOR)
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='parsed-source cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='always re-parse the sources')
+    parser.add_argument('--clear-cache', action='store_true', help='empty the parsed-source cache and exit')
+    parser.add_argument('--no-staging', action='store_true', help='skip the audit copy in the staging database')
+    parser.add_argument('--no-summaries', action='store_true', help='drop the summary_* report tables instead of rebuilding them')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='report per-stage Python/NumPy allocation peaks (slower)')
+    args = parser.parse_args(argv)
+
+    if args.clear_cache:
+        print(f"Removed {clear_cache(args.cache_dir)} cached frame(s) from {args.cache_dir}")
+        return
+
+    # Only a bad --stages or --years is a usage error; failures while the ETL
+    # runs keep their traceback
+    try:
+        stages = resolve_stages([s.strip() for s in args.stages.split(',') if s.strip()])
+        years = YEARS if args.years is None else parse_years(args.years)
+    except ValueError as e:
+        parser.error(str(e))
+
+    source_files = {
+        'quality': args.quality_csv or SOURCE_FILES['quality'],
+        'gdp': args.gdp_xlsx or SOURCE_FILES['gdp'],
+        'population': args.population_xml or SOURCE_FILES['population'],
+    }
+    run_pipeline(
+        stages=stages,
+        source_files=source_files,
+        source_db_url=args.source_db_url,
+        dw_url=args.dw_url,
+        refresh_mode=args.refresh_mode,
+        load_method=args.load_method,
+        chunksize=args.chunksize,
+        executor=args.executor,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        stage_sources=STAGE_SOURCES and not args.no_staging,
+        summaries=REFRESH_SUMMARIES and not args.no_summaries,
+        years=years,
+        trace_memory=args.trace_memory,
+    )
+
+
+if __name__ == '__main__':
+    main()
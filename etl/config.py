@@ -0,0 +1,65 @@
+import os
+
+import db
+
+# --- Connections ---
+# Staging database (audit copy of the raw sources) and the warehouse; the
+# shared defaults and pool settings live in db.py.
+SOURCE_DB_URL = os.environ.get('ETL_SOURCE_DB_URL', db.SOURCE_DB_URL)
+DW_URL = os.environ.get('ETL_DW_URL', db.DW_URL)
+
+# --- Pipeline ---
+# Raw sources feed the dim/fact builders straight from memory. The copy in
+# source_database is only an audit trail, written in the background;
+# set ETL_STAGING=0 to skip it.
+STAGE_SOURCES = os.environ.get('ETL_STAGING', '1') != '0'
+
+# Warehouse bulk-load path (see BULK_LOADERS) and rows per round-trip.
+# 'load_data' needs local_infile enabled on the MySQL server.
+LOAD_METHOD = os.environ.get('ETL_LOAD_METHOD', 'executemany')
+LOAD_CHUNKSIZE = int(os.environ.get('ETL_LOAD_CHUNKSIZE', '10000'))
+
+# 'full' truncates and reloads the warehouse; 'incremental' skips the run
+# when no source file changed and otherwise upserts only new/changed rows.
+REFRESH_MODE = os.environ.get('ETL_REFRESH_MODE', 'full')
+
+# Rebuild the summary_* tables the reports read after every load; with
+# ETL_SUMMARIES=0 they are dropped instead and the reports fall back to
+# the live aggregations.
+REFRESH_SUMMARIES = os.environ.get('ETL_SUMMARIES', '1') != '0'
+
+# Input files per source type; a type may span several files (for example
+# one GDP workbook per year range). All files are parsed concurrently in a
+# 'process' or 'thread' pool.
+SOURCE_FILES = {
+    'quality': ['Quality_of_Life-2.csv'],
+    'gdp': ['2020-2025-2.xlsx'],
+    'population': ['API_SP.POP.TOTL_DS2_en_xml_v2_1021474-2.xml'],
+}
+INGEST_EXECUTOR = os.environ.get('ETL_INGEST_EXECUTOR', 'process')
+
+def parse_years(text):
+    """Parse a 'first-last' year range into (first, last); either end may be
+    left open ('2000-', '-2020') and an empty string means every year.
+    """
+    text = text.strip()
+    if not text:
+        return None, None
+    first, sep, last = text.partition('-')
+    try:
+        first = int(first) if first.strip() else None
+        last = (int(last) if last.strip() else None) if sep else first
+    except ValueError:
+        raise ValueError(f"Invalid year range {text!r}; expected FIRST-LAST, e.g. 2000-2020") from None
+    if first is not None and last is not None and first > last:
+        raise ValueError(f"Invalid year range {text!r}; {first} is after {last}")
+    return first, last
+
+# Years of the population source to load, as 'first-last' (either end open);
+# records outside the range are skipped while the XML is parsed.
+YEARS = parse_years(os.environ.get('ETL_YEARS', ''))
+
+# Parsed, normalized sources are cached as Arrow files keyed by content hash;
+# set ETL_CACHE_DIR= (empty) to disable, `python -m etl --clear-cache` to wipe.
+CACHE_DIR = os.environ.get('ETL_CACHE_DIR', '.etl_cache')
+CACHE_MAX_BYTES = int(os.environ.get('ETL_CACHE_MAX_MB', '512')) * 1024 * 1024
@@ -0,0 +1,95 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+# --- Country name normalization map ---
+name_map = {
+    "bahamas": "bahamas, the",
+    "brunei": "brunei darussalam",
+    "cape verde": "cabo verde",
+    "democratic republic of the congo": "congo, dem. rep.",
+    "republic of the congo": "congo, rep.",
+    "ivory coast": "cote d'ivoire",
+    "czech republic": "czechia",
+    "egypt": "egypt, arab rep.",
+    "gambia": "gambia, the",
+    "hong kong": "hong kong sar, china",
+    "hong kong (china)": "hong kong sar, china",
+    "iran": "iran, islamic rep.",
+    "south korea": "korea, rep.",
+    "kosovo (disputed territory)": "kosovo",
+    "kyrgyzstan": "kyrgyz republic",
+    "laos": "lao pdr",
+    "macau": "macao sar, china",
+    "macao": "macao sar, china",
+    "macao (china)": "macao sar, china",
+    "micronesia": "micronesia, fed. sts.",
+    "federated states of micronesia": "micronesia, fed. sts.",
+    "puerto rico": "puerto rico (us)",
+    "russia": "russian federation",
+    "são tomé and príncipe": "sao tome and principe",
+    "slovakia": "slovak republic",
+    "saint kitts and nevis": "st. kitts and nevis",
+    "saint lucia": "st. lucia",
+    "saint vincent and the grenadines": "st. vincent and the grenadines",
+    "syria": "syrian arab republic",
+    "turkey": "turkiye",
+    "venezuela": "venezuela, rb",
+    "vietnam": "viet nam",
+    "yemen": "yemen, rep."
+}
+
+# Alias index keyed on the stripped, lowercased spelling; built once
+alias_index = {k.strip().lower(): v for k, v in name_map.items()}
+
+# Resolved form of every raw spelling seen so far, shared across datasets
+_normalized_names = {}
+
+# Column holding the raw country name in each source
+COUNTRY_COLUMNS = {
+    'quality': 'country',
+    'gdp': 'Country Name',
+    'population': 'Country or Area',
+}
+
+def normalize_country(name):
+    """Standardize and map country names to a common lowercase form."""
+    if not isinstance(name, str):
+        return name
+    n = name.strip().lower()
+    return alias_index.get(n, n)
+
+def normalize_countries(names):
+    """Vectorized normalize_country over a Series of raw names.
+
+    Each distinct spelling is resolved once with .str ops and the alias index,
+    memoized for later calls, then broadcast back to rows through the
+    factorized codes. Missing values stay missing.
+    """
+    codes, uniques = pd.factorize(names)
+    pending = [u for u in uniques if u not in _normalized_names]
+    if pending:
+        raw = pd.Series(pending, dtype=object)
+        is_str = np.array([isinstance(u, str) for u in pending], dtype=bool)
+        cleaned = raw[is_str].str.strip().str.lower()
+        resolved = cleaned.map(alias_index).fillna(cleaned)
+        _normalized_names.update(zip(raw[is_str], resolved))
+        _normalized_names.update((u, u) for u in raw[~is_str])
+
+    lookup = np.array([_normalized_names[u] for u in uniques] + [np.nan], dtype=object)
+    return pd.Series(lookup[codes], index=names.index, name=names.name)
+
+def normalize_source(source, df):
+    """Add the normalized country_norm column to one parsed source frame."""
+    df['country_norm'] = normalize_countries(df[COUNTRY_COLUMNS[source]])
+    return df
+
+def unmapped_countries(names, known):
+    """Return the distinct raw names whose normalized form is not in known."""
+    normalized = normalize_countries(names)
+    mask = names.notna() & ~normalized.isin(set(known))
+    return sorted(names[mask].unique())
+
+def alias_fingerprint():
+    """Hash of the alias index, used to invalidate cached normalized frames."""
+    return hashlib.sha256(repr(sorted(alias_index.items())).encode()).hexdigest()
@@ -0,0 +1,259 @@
+import hashlib
+import os
+import time
+import numpy as np
+import pandas as pd
+import xml.etree.ElementTree as ET
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .config import CACHE_DIR, CACHE_MAX_BYTES, INGEST_EXECUTOR, SOURCE_FILES, YEARS
+from .countries import alias_fingerprint, normalize_source
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # the parsed-source cache is optional
+    feather = None
+
+# Bump whenever a reader's output changes so cached frames are re-parsed
+PARSER_VERSION = 1
+
+
+def read_quality_csv(path):
+    """Read the Quality of Life CSV."""
+    return pd.read_csv(path)
+
+def read_gdp_excel(path):
+    """Read a GDP workbook and melt it from wide (one column per year) to long."""
+    gdp = pd.read_excel(path)
+    if 'Country' in gdp.columns:
+        gdp = pd.melt(gdp, id_vars=['Country'], var_name='Year', value_name='Value')
+        gdp.rename(columns={'Country': 'Country Name'}, inplace=True)
+    gdp['Year'] = pd.to_numeric(gdp['Year'], errors='coerce')
+    gdp['Value'] = pd.to_numeric(gdp['Value'], errors='coerce')
+    return gdp
+
+def read_population_xml(path, min_year=None, max_year=None):
+    """Stream the World Bank population XML into typed columns.
+
+    Records are parsed one at a time with iterparse and cleared as soon as
+    they are consumed, so memory stays flat regardless of file size. Years
+    outside [min_year, max_year] are skipped; missing values load as 0.
+    """
+    countries = []
+    codes = []
+    years = array('i')
+    populations = array('q')
+
+    context = ET.iterparse(path, events=('start', 'end'))
+    _, root = next(context)
+    parent = root
+    for event, elem in context:
+        if event == 'start':
+            if elem.tag == 'data':
+                parent = elem
+            continue
+        if elem.tag != 'record':
+            continue
+
+        country = code = year = value = None
+        for field in elem:
+            name = field.get('name')
+            if name == 'Country or Area':
+                country = field.text
+                code = field.get('key')
+            elif name == 'Year':
+                year = field.text
+            elif name == 'Value':
+                value = field.text
+        parent.clear()
+
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            continue
+        if (min_year is not None and year < min_year) or (max_year is not None and year > max_year):
+            continue
+
+        countries.append(country)
+        codes.append(code)
+        years.append(year)
+        try:
+            populations.append(int(value))
+        except (TypeError, ValueError):
+            populations.append(0)
+
+    return pd.DataFrame({
+        'Country or Area': countries,
+        'Country Code': codes,
+        'Year': np.frombuffer(years, dtype=np.int32),
+        'Population': np.frombuffer(populations, dtype=np.int64),
+    })
+
+READERS = {
+    'quality': read_quality_csv,
+    'gdp': read_gdp_excel,
+    'population': read_population_xml,
+}
+
+def reader_options(years=(None, None)):
+    """Extra reader keyword arguments per source type for a (first, last)
+    year range; only the population reader filters by year.
+    """
+    min_year, max_year = years
+    if min_year is None and max_year is None:
+        return {}
+    return {'population': {'min_year': min_year, 'max_year': max_year}}
+
+def options_tag(options):
+    """Stable text form of one source's reader options, for cache keys and
+    load fingerprints; empty when the reader runs with its defaults.
+    """
+    return ','.join(f'{k}={v}' for k, v in sorted(options.items())) if options else ''
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# --- Parsed-source cache ---
+# Parsed (and normalized) frames are stored as uncompressed Arrow IPC files
+# named after the source file's content hash, the parser version and a
+# caller-supplied tag, so an edited input or reader never hits a stale entry.
+
+def cache_key(source, digest, tag=''):
+    return hashlib.sha256(f'{source}:{digest}:{PARSER_VERSION}:{tag}'.encode()).hexdigest()
+
+def read_cached(cache_dir, key):
+    """Return the cached frame for key, memory-mapped, or None on a miss."""
+    path = os.path.join(cache_dir, f'{key}.arrow')
+    if feather is None or not os.path.exists(path):
+        return None
+    os.utime(path)  # mark as recently used for eviction
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+def write_cached(cache_dir, key, df, max_bytes):
+    """Store df under key, then evict old entries beyond max_bytes."""
+    if feather is None:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f'{key}.arrow')
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"WARNING: could not cache parsed source ({e})")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    evict_cache(cache_dir, max_bytes)
+
+def evict_cache(cache_dir, max_bytes):
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    entries = [e for e in os.scandir(cache_dir) if e.name.endswith('.arrow')]
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    total = sum(e.stat().st_size for e in entries)
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        total -= entry.stat().st_size
+        os.remove(entry.path)
+
+def clear_cache(cache_dir):
+    """Delete every cached frame; returns the number of entries removed."""
+    if not os.path.isdir(cache_dir):
+        return 0
+    removed = 0
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(('.arrow', '.tmp')):
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+def _timed_read(source, path, options):
+    start = time.perf_counter()
+    df = READERS[source](path, **options)
+    return df, time.perf_counter() - start
+
+def _make_pool(executor, max_workers):
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers)
+    return ThreadPoolExecutor(max_workers)
+
+def extract_sources(sources, executor='process', max_workers=None, normalize=None,
+                    cache_dir=None, cache_tag='', cache_max_bytes=512 * 1024 * 1024, options=None):
+    """Parse every source file concurrently.
+
+    sources maps a source type ('quality', 'gdp', 'population') to a list of
+    paths; files of one type are concatenated in the order given. Each file's
+    frame is passed through normalize(source, df) when given, and options maps
+    a source type to extra reader keyword arguments (see reader_options).
+    With cache_dir set, files already parsed are loaded from the cache instead.
+
+    Returns ({source type: DataFrame}, {(source type, path): (seconds, origin)})
+    where origin is 'parsed' or 'cached'.
+    """
+    options = options or {}
+    use_cache = bool(cache_dir) and feather is not None
+    if cache_dir and feather is None:
+        print("pyarrow is not installed; parsed-source cache disabled")
+
+    results = {}
+    keys = {}
+    pending = []
+    for source, paths in sources.items():
+        for path in paths:
+            job = (source, path)
+            if use_cache:
+                start = time.perf_counter()
+                tag = f'{cache_tag}:{options_tag(options.get(source))}'
+                keys[job] = cache_key(source, file_digest(path), tag)
+                df = read_cached(cache_dir, keys[job])
+                if df is not None:
+                    results[job] = (df, time.perf_counter() - start, 'cached')
+                    continue
+            pending.append(job)
+
+    if pending:
+        with _make_pool(executor, max_workers or len(pending)) as pool:
+            futures = {job: pool.submit(_timed_read, *job, options.get(job[0], {})) for job in pending}
+            for job, future in futures.items():
+                df, elapsed = future.result()
+                if normalize is not None:
+                    df = normalize(job[0], df)
+                if use_cache:
+                    write_cached(cache_dir, keys[job], df, cache_max_bytes)
+                results[job] = (df, elapsed, 'parsed')
+
+    frames = {
+        source: pd.concat([results[(source, path)][0] for path in paths], ignore_index=True)
+        for source, paths in sources.items()
+    }
+    timings = {job: (elapsed, origin) for job, (_, elapsed, origin) in results.items()}
+    return frames, timings
+
+def extract(source_files=SOURCE_FILES, executor=INGEST_EXECUTOR, cache_dir=CACHE_DIR,
+            cache_max_bytes=CACHE_MAX_BYTES, years=YEARS):
+    """Extract stage: parse (or load from cache) and normalize every source,
+    keeping only population records within years (first, last).
+
+    Returns {'quality': DataFrame, 'gdp': DataFrame, 'population': DataFrame}.
+    """
+    start = time.perf_counter()
+    frames, timings = extract_sources(
+        source_files,
+        executor=executor,
+        normalize=normalize_source,
+        cache_dir=cache_dir,
+        cache_tag=alias_fingerprint(),
+        cache_max_bytes=cache_max_bytes,
+        options=reader_options(years),
+    )
+    for (source, path), (elapsed, origin) in timings.items():
+        print(f"  {source:<12} {path:<48} {elapsed:8.2f} s  ({origin})")
+    print(f"  {'ingest wall time':<61} {time.perf_counter() - start:8.2f} s")
+    return frames
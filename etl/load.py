@@ -0,0 +1,388 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import uuid
+import pandas as pd
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import text
+
+from db import create_pooled_engine, get_engine
+
+from .config import DW_URL, LOAD_CHUNKSIZE, LOAD_METHOD, REFRESH_MODE, REFRESH_SUMMARIES, SOURCE_FILES
+from .extract import file_digest, options_tag
+from .schema import create_schema
+from .summaries import drop_summaries, refresh_summaries
+
+# Key, numeric and text columns of each warehouse table, in load order.
+# Numeric columns are compared at the schema's DECIMAL(_, 2) precision.
+WAREHOUSE_TABLES = {
+    'dim_region': (['region_key'], [], ['region_name']),
+    'dim_country': (['country_key'], ['region_key'], ['country_name', 'country_code']),
+    'dim_time': (['time_key'], ['year_value', 'is_historical'], ['period_type']),
+    'dim_quality_of_life': (
+        ['country_key'],
+        ['purchasing_power_value', 'safety_value', 'health_care_value', 'climate_value',
+         'cost_of_living_value', 'property_price_income_value', 'traffic_commute_value',
+         'pollution_value', 'quality_of_life_value'],
+        ['purchasing_power_category', 'safety_category', 'health_care_category',
+         'climate_category', 'cost_of_living_category', 'property_price_income_category',
+         'traffic_commute_category', 'pollution_category', 'quality_of_life_category'],
+    ),
+    'fact_country_metrics': (['country_key', 'time_key'], ['gdp_usd', 'population', 'gdp_per_capita'], []),
+}
+
+@contextmanager
+def registered_frame(connection, df, name='etl_frame'):
+    """Expose df to SQL on a DuckDB connection as the view name."""
+    duckdb_connection = connection.connection.driver_connection
+    duckdb_connection.register(name, df)
+    try:
+        yield name
+    finally:
+        duckdb_connection.unregister(name)
+
+def replace_table(df, table, engine):
+    """Replace table with the contents of df, creating it from df's dtypes."""
+    if engine.dialect.name == 'duckdb':
+        with engine.begin() as connection, registered_frame(connection, df) as frame:
+            connection.execute(text(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM {frame}"))
+    else:
+        df.to_sql(table, con=engine, if_exists='replace', index=False)
+
+def stage_sources_async(frames, engine):
+    """Write snapshots of the raw frames to the staging database on a
+    background thread and return the thread so the caller can join it.
+    """
+    snapshots = {table: df.copy() for table, df in frames.items()}
+
+    def write():
+        for table, df in snapshots.items():
+            try:
+                replace_table(df, table, engine)
+            except Exception as e:
+                print(f"WARNING: staging write for {table} failed: {e}")
+
+    thread = threading.Thread(target=write, name='etl-staging')
+    thread.start()
+    return thread
+
+def load_executemany(df, table, engine, chunksize):
+    """Append df with one batched executemany per chunk."""
+    df.to_sql(table, con=engine, if_exists='append', index=False, chunksize=chunksize)
+
+def load_multirow(df, table, engine, chunksize):
+    """Append df with multi-row INSERT ... VALUES statements."""
+    if engine.dialect.name == 'sqlite':
+        # SQLite caps bound parameters per statement
+        chunksize = max(1, min(chunksize, 999 // max(1, len(df.columns))))
+    df.to_sql(table, con=engine, if_exists='append', index=False, chunksize=chunksize, method='multi')
+
+def load_data_infile(df, table, engine, chunksize):
+    """Stream df through a temporary TSV into MySQL LOAD DATA LOCAL INFILE."""
+    bool_cols = df.select_dtypes(include='bool').columns
+    if len(bool_cols):
+        df = df.astype({c: 'int8' for c in bool_cols})
+
+    fd, path = tempfile.mkstemp(prefix=f'{table}_', suffix='.tsv')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            df.to_csv(f, sep='\t', header=False, index=False, na_rep='\\N',
+                      lineterminator='\n', chunksize=chunksize)
+        columns = ', '.join(f'`{c}`' for c in df.columns)
+        with engine.begin() as connection:
+            connection.execute(text(
+                f"LOAD DATA LOCAL INFILE :path INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+                f"FIELDS TERMINATED BY '\\t' OPTIONALLY ENCLOSED BY '\"' "
+                f"LINES TERMINATED BY '\\n' ({columns})"
+            ), {'path': path})
+    finally:
+        os.remove(path)
+
+def load_duckdb_append(df, table, engine, chunksize):
+    """Append df in one vectorized INSERT ... SELECT over the registered frame."""
+    columns = ', '.join(df.columns)
+    with engine.begin() as connection, registered_frame(connection, df) as frame:
+        connection.execute(text(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {frame}"))
+
+BULK_LOADERS = {
+    'executemany': load_executemany,
+    'multi': load_multirow,
+    'load_data': load_data_infile,
+    'duckdb_append': load_duckdb_append,
+}
+
+def bulk_load(tables, engine, method=LOAD_METHOD, chunksize=LOAD_CHUNKSIZE):
+    """Append each frame of tables (name -> DataFrame, in load order) with
+    the selected bulk loader and return per-table timings in seconds.
+    """
+    dialect = engine.dialect.name
+    if dialect == 'duckdb' and method != 'duckdb_append':
+        # Row-at-a-time INSERTs are very slow on a columnar engine
+        print(f"Using duckdb_append instead of {method} on DuckDB")
+        method = 'duckdb_append'
+    elif method == 'load_data' and dialect != 'mysql':
+        print(f"LOAD DATA is MySQL-only; falling back to executemany on {dialect}")
+        method = 'executemany'
+    elif method == 'duckdb_append' and dialect != 'duckdb':
+        print(f"duckdb_append is DuckDB-only; falling back to executemany on {dialect}")
+        method = 'executemany'
+    loader = BULK_LOADERS[method]
+
+    timings = {}
+    for table, df in tables.items():
+        start = time.perf_counter()
+        loader(df, table, engine, chunksize)
+        timings[table] = time.perf_counter() - start
+        print(f"  {table:<24} {len(df):>10,} rows  {timings[table]:8.2f} s  ({method})")
+    return timings
+
+def source_fingerprint(paths):
+    """Combined fingerprint of all files of one source type."""
+    if len(paths) == 1:
+        return file_digest(paths[0])
+    return hashlib.sha256(''.join(file_digest(p) for p in paths).encode()).hexdigest()
+
+def ensure_metadata_table(engine):
+    """Create the tables that record which source files were last loaded and
+    the warehouse load version.
+    """
+    with engine.begin() as connection:
+        connection.execute(text("""
+            CREATE TABLE IF NOT EXISTS etl_source_files (
+                source_name VARCHAR(50) PRIMARY KEY,
+                file_name VARCHAR(255),
+                sha256 CHAR(64),
+                loaded_at DATETIME
+            )
+        """))
+        connection.execute(text("""
+            CREATE TABLE IF NOT EXISTS etl_load_version (
+                version_id TINYINT PRIMARY KEY,
+                load_version BIGINT NOT NULL,
+                loaded_at DATETIME,
+                load_token CHAR(32)
+            )
+        """))
+        # Warehouses created before load_token existed
+        columns = connection.execute(text("SELECT * FROM etl_load_version WHERE 1 = 0")).keys()
+        if 'load_token' not in columns:
+            connection.execute(text("ALTER TABLE etl_load_version ADD COLUMN load_token CHAR(32)"))
+
+def loaded_fingerprints(engine):
+    """Return {source_name: sha256} for the last successful load."""
+    df = pd.read_sql(text("SELECT source_name, sha256 FROM etl_source_files"), engine)
+    return dict(zip(df['source_name'], df['sha256']))
+
+def row_hashes(df, key_cols, numeric_cols, text_cols):
+    """Hash the non-key columns of each row, indexed by the key columns.
+
+    Numerics are scaled to integer cents so values read back from DECIMAL
+    columns hash the same as the freshly computed floats.
+    """
+    values = pd.DataFrame(index=df.index)
+    for col in numeric_cols:
+        values[col] = pd.to_numeric(df[col], errors='coerce').astype(float).mul(100).round().fillna(-1).astype('int64')
+    for col in text_cols:
+        values[col] = df[col].astype(object).where(df[col].notna(), '').astype(str)
+    hashes = pd.util.hash_pandas_object(values, index=False)
+    hashes.index = pd.MultiIndex.from_frame(df[key_cols].astype('int64'))
+    return hashes
+
+def changed_rows(new_df, existing_df, key_cols, numeric_cols, text_cols):
+    """Return the rows of new_df that are missing from or differ in existing_df."""
+    new_hashes = row_hashes(new_df, key_cols, numeric_cols, text_cols)
+    old_hashes = row_hashes(existing_df, key_cols, numeric_cols, text_cols)
+    previous = old_hashes.reindex(new_hashes.index)
+    mask = previous.isna().to_numpy() | (previous.to_numpy() != new_hashes.to_numpy())
+    return new_df[mask]
+
+def removed_rows(new_df, existing_df, key_cols):
+    """Return the keys of existing_df rows that are no longer in new_df."""
+    new_keys = pd.MultiIndex.from_frame(new_df[key_cols].astype('int64'))
+    old_keys = existing_df[key_cols].astype('int64')
+    return old_keys[~pd.MultiIndex.from_frame(old_keys).isin(new_keys)]
+
+def stable_country_keys(dim_country, existing):
+    """Map this run's country keys onto the keys already in the warehouse.
+
+    Countries are matched by name; new countries get keys above the current
+    maximum so fact rows already loaded keep pointing at the right country.
+    """
+    known = dict(zip(existing['country_name'], existing['country_key']))
+    next_key = int(existing['country_key'].max()) + 1 if len(existing) else 1
+    mapping = {}
+    for key, name in zip(dim_country['country_key'], dim_country['country_name']):
+        if name in known:
+            mapping[key] = int(known[name])
+        else:
+            mapping[key] = next_key
+            next_key += 1
+    return mapping
+
+def upsert(df, table, connection, key_cols, chunksize=LOAD_CHUNKSIZE):
+    """Insert or update df rows keyed on key_cols through connection."""
+    if df.empty:
+        return
+    cols = list(df.columns)
+    names = ', '.join(cols)
+    params = ', '.join(f':{c}' for c in cols)
+    if connection.dialect.name == 'mysql':
+        updates = ', '.join(f'{c} = VALUES({c})' for c in cols if c not in key_cols)
+        sql = f"INSERT INTO {table} ({names}) VALUES ({params}) ON DUPLICATE KEY UPDATE {updates}"
+    else:
+        updates = ', '.join(f'{c} = excluded.{c}' for c in cols if c not in key_cols)
+        sql = f"INSERT INTO {table} ({names}) VALUES ({params}) ON CONFLICT ({', '.join(key_cols)}) DO UPDATE SET {updates}"
+
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    for start in range(0, len(records), chunksize):
+        connection.execute(text(sql), records[start:start + chunksize])
+
+def delete_rows(keys, table, connection, key_cols, chunksize=LOAD_CHUNKSIZE):
+    """Delete the rows of table whose key_cols match a row of keys."""
+    if keys.empty:
+        return
+    condition = ' AND '.join(f'{c} = :{c}' for c in key_cols)
+    records = keys[key_cols].astype(object).to_dict('records')
+    for start in range(0, len(records), chunksize):
+        connection.execute(text(f"DELETE FROM {table} WHERE {condition}"), records[start:start + chunksize])
+
+def clear_warehouse(connection):
+    """Empty the warehouse tables before a full reload."""
+    # Dependent tables first
+    tables = ['fact_country_metrics', 'dim_quality_of_life', 'dim_country', 'dim_region', 'dim_time']
+    if connection.dialect.name == 'mysql':
+        connection.execute(text("SET FOREIGN_KEY_CHECKS = 0;"))
+        for table in tables:
+            connection.execute(text(f"TRUNCATE TABLE {table};"))
+        connection.execute(text("SET FOREIGN_KEY_CHECKS = 1;"))
+    else:
+        # SQLite has no TRUNCATE; DuckDB's is a DELETE as well
+        for table in tables:
+            connection.execute(text(f"DELETE FROM {table}"))
+
+def source_fingerprints(source_files, options=None):
+    """Return {source type: fingerprint} for every configured source; reader
+    options (see extract.reader_options) are folded in, so changing the year
+    range counts as a changed source.
+    """
+    options = options or {}
+    fingerprints = {}
+    for name, paths in source_files.items():
+        fingerprint = source_fingerprint(paths)
+        tag = options_tag(options.get(name))
+        if tag:
+            fingerprint = hashlib.sha256(f'{fingerprint}:{tag}'.encode()).hexdigest()
+        fingerprints[name] = fingerprint
+    return fingerprints
+
+def sources_changed(engine, fingerprints):
+    """Return the source types whose fingerprint differs from the last load."""
+    ensure_metadata_table(engine)
+    previous = loaded_fingerprints(engine)
+    return [name for name, digest in fingerprints.items() if previous.get(name) != digest]
+
+def record_fingerprints(connection, fingerprints, source_files):
+    """Store the fingerprints of the sources that were just loaded."""
+    loaded_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    upsert(pd.DataFrame([
+        {'source_name': name, 'file_name': ';'.join(source_files[name])[:255], 'sha256': digest, 'loaded_at': loaded_at}
+        for name, digest in fingerprints.items()
+    ]), 'etl_source_files', connection, ['source_name'])
+
+def bump_load_version(connection):
+    """Increment the single-row load version that report caches key on, with
+    a token unique to this load (the counter restarts when a warehouse is
+    recreated).
+    """
+    row = connection.execute(text("SELECT load_version FROM etl_load_version WHERE version_id = 1")).fetchone()
+    version = (row[0] if row else 0) + 1
+    upsert(pd.DataFrame([{
+        'version_id': 1, 'load_version': version,
+        'loaded_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 'load_token': uuid.uuid4().hex,
+    }]), 'etl_load_version', connection, ['version_id'])
+    return version
+
+def create_dw_engine(url=DW_URL, load_method=LOAD_METHOD):
+    """Engine for the warehouse; LOAD DATA LOCAL needs local_infile on the client."""
+    if load_method == 'load_data' and url.startswith('mysql'):
+        return create_pooled_engine(url, connect_args={'local_infile': True})
+    return get_engine(url)
+
+def load(tables, engine, refresh_mode=REFRESH_MODE, fingerprints=None, source_files=SOURCE_FILES,
+         method=LOAD_METHOD, chunksize=LOAD_CHUNKSIZE, summaries=REFRESH_SUMMARIES):
+    """Load stage: write the dims and fact (name -> DataFrame, in load order)
+    to the warehouse, record the source fingerprints, rebuild the summary
+    tables and bump the load version.
+
+    'full' truncates and bulk loads every table; 'incremental' upserts only
+    new or changed rows, and deletes rows no longer in the sources, in a
+    single transaction.
+    """
+    tables = dict(tables)
+    tables['dim_country'] = tables['dim_country'].assign(
+        country_name=tables['dim_country']['country_name'].str.title()
+    )
+    create_schema(engine)
+    ensure_metadata_table(engine)
+
+    if refresh_mode == 'incremental':
+        # --- Delta refresh: upsert new/changed rows in a single transaction ---
+        existing_countries = pd.read_sql(text("SELECT country_key, country_name FROM dim_country"), engine)
+        key_map = stable_country_keys(tables['dim_country'], existing_countries)
+        for table in ('dim_country', 'dim_quality_of_life', 'fact_country_metrics'):
+            tables[table] = tables[table].assign(country_key=tables[table]['country_key'].map(key_map))
+
+        print("\n--- Applying incremental refresh ---")
+        timings = {}
+        with engine.begin() as connection:
+            deltas, removed = {}, {}
+            for table, df in tables.items():
+                key_cols, numeric_cols, text_cols = WAREHOUSE_TABLES[table]
+                start = time.perf_counter()
+                existing = pd.read_sql(text(f"SELECT * FROM {table}"), connection)
+                deltas[table] = changed_rows(df, existing, key_cols, numeric_cols, text_cols)
+                removed[table] = removed_rows(df, existing, key_cols)
+                timings[table] = time.perf_counter() - start
+            # Rows gone from the sources are deleted dependent tables first,
+            # as a full reload would drop them
+            for table in reversed(tables):
+                start = time.perf_counter()
+                delete_rows(removed[table], table, connection, WAREHOUSE_TABLES[table][0], chunksize)
+                timings[table] += time.perf_counter() - start
+            for table, df in tables.items():
+                start = time.perf_counter()
+                upsert(deltas[table], table, connection, WAREHOUSE_TABLES[table][0], chunksize)
+                timings[table] += time.perf_counter() - start
+                print(f"  {table:<24} {len(deltas[table]):>10,} / {len(df):<10,} rows upserted, "
+                      f"{len(removed[table]):,} deleted  {timings[table]:8.2f} s")
+            if fingerprints:
+                record_fingerprints(connection, fingerprints, source_files)
+    else:
+        with engine.connect() as connection:
+            with connection.begin():
+                clear_warehouse(connection)
+
+        print("\n--- Bulk loading warehouse tables ---")
+        timings = bulk_load(tables, engine, method, chunksize)
+        print(f"  {'total':<24} {'':>15}  {sum(timings.values()):8.2f} s")
+
+        if fingerprints:
+            with engine.begin() as connection:
+                record_fingerprints(connection, fingerprints, source_files)
+
+    if summaries:
+        refresh_summaries(engine)
+    else:
+        # Stale summaries would hide this load from the reports
+        drop_summaries(engine)
+
+    # Last, so cached reports never pair the new version with old data
+    with engine.begin() as connection:
+        version = bump_load_version(connection)
+    print(f"Warehouse load version is now {version}")
+
+    print("\n--- Data loaded into data warehouse successfully! ---")
+    return timings
@@ -0,0 +1,137 @@
+import time
+import tracemalloc
+from db import get_engine
+from query_metrics import query_label
+
+from .config import (
+    CACHE_DIR, CACHE_MAX_BYTES, DW_URL, INGEST_EXECUTOR, LOAD_CHUNKSIZE, LOAD_METHOD,
+    REFRESH_MODE, REFRESH_SUMMARIES, SOURCE_DB_URL, SOURCE_FILES, STAGE_SOURCES, YEARS,
+)
+from .extract import extract, reader_options
+from .load import create_dw_engine, load, source_fingerprints, sources_changed, stage_sources_async
+from .regions import build_dim_region
+from .transform import (
+    build_dim_country, build_dim_quality_of_life, build_dim_time, build_fact, normalize,
+)
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Stages in execution order, with the stages each one needs to have run
+STAGES = {
+    'extract': [],
+    'normalize': ['extract'],
+    'build_dim_region': [],
+    'build_dim_country': ['normalize'],
+    'build_dim_time': ['normalize'],
+    'build_dim_quality_of_life': ['build_dim_country'],
+    'build_fact': ['build_dim_country', 'build_dim_time'],
+    'load': ['build_dim_region', 'build_dim_country', 'build_dim_time', 'build_dim_quality_of_life', 'build_fact'],
+}
+
+
+def resolve_stages(requested):
+    """Return the requested stages plus their dependencies, in run order."""
+    unknown = [s for s in requested if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}. Choose from: {', '.join(STAGES)}")
+    selected = set()
+    pending = list(requested)
+    while pending:
+        stage = pending.pop()
+        if stage not in selected:
+            selected.add(stage)
+            pending.extend(STAGES[stage])
+    return [s for s in STAGES if s in selected]
+
+def _peak_rss_mb():
+    if resource is None:
+        return float('nan')
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_pipeline(stages=None, source_files=SOURCE_FILES, source_db_url=SOURCE_DB_URL, dw_url=DW_URL,
+                 refresh_mode=REFRESH_MODE, load_method=LOAD_METHOD, chunksize=LOAD_CHUNKSIZE,
+                 executor=INGEST_EXECUTOR, cache_dir=CACHE_DIR, cache_max_bytes=CACHE_MAX_BYTES,
+                 stage_sources=STAGE_SOURCES, summaries=REFRESH_SUMMARIES, years=YEARS,
+                 trace_memory=False):
+    """Run the selected ETL stages (all by default) and their dependencies.
+
+    years is the (first, last) range of population records to load, either
+    end None for open. Prints per-stage wall time and memory, and returns (outputs, report) where
+    outputs maps stage name to its result and report is a list of
+    (stage, seconds, peak RSS MB, traced peak MB or None).
+    """
+    run = resolve_stages(stages or list(STAGES))
+    outputs = {}
+    report = []
+
+    fingerprints = None
+    dw_engine = None
+    if 'load' in run:
+        dw_engine = create_dw_engine(dw_url, load_method)
+        fingerprints = source_fingerprints(source_files, reader_options(years))
+        if refresh_mode == 'incremental':
+            changed = sources_changed(dw_engine, fingerprints)
+            if not changed:
+                print("--- Sources unchanged since the last load; nothing to refresh ---")
+                return outputs, report
+            print("Changed sources:", changed)
+
+    staging_thread = None
+    steps = {
+        'extract': lambda: extract(source_files, executor, cache_dir, cache_max_bytes, years),
+        'normalize': lambda: normalize(outputs['extract']),
+        'build_dim_region': build_dim_region,
+        'build_dim_country': lambda: build_dim_country(outputs['normalize']['gdp'], outputs['normalize']['population']),
+        'build_dim_time': lambda: build_dim_time(outputs['normalize']['gdp'], outputs['normalize']['population']),
+        'build_dim_quality_of_life': lambda: build_dim_quality_of_life(outputs['normalize']['quality'], outputs['build_dim_country']),
+        'build_fact': lambda: build_fact(outputs['normalize']['gdp'], outputs['normalize']['population'],
+                                         outputs['build_dim_country'], outputs['build_dim_time']),
+        'load': lambda: load({
+            'dim_region': outputs['build_dim_region'],
+            'dim_country': outputs['build_dim_country'],
+            'dim_time': outputs['build_dim_time'],
+            'dim_quality_of_life': outputs['build_dim_quality_of_life'],
+            'fact_country_metrics': outputs['build_fact'],
+        }, dw_engine, refresh_mode, fingerprints, source_files, load_method, chunksize, summaries),
+    }
+
+    for stage in run:
+        print(f"\n=== {stage} ===")
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with query_label(f'etl.{stage}'):
+            outputs[stage] = steps[stage]()
+        elapsed = time.perf_counter() - start
+        traced = None
+        if trace_memory:
+            traced = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+        report.append((stage, elapsed, _peak_rss_mb(), traced))
+
+        if stage == 'extract' and stage_sources:
+            # Audit copy of the raw sources, written off the critical path
+            staging_thread = stage_sources_async({
+                'quality_of_life': outputs['extract']['quality'],
+                'gdp': outputs['extract']['gdp'],
+                'population': outputs['extract']['population'],
+            }, get_engine(source_db_url))
+
+    if staging_thread is not None:
+        staging_thread.join()
+        print("--- Staging write to source_database finished ---")
+
+    print_report(report)
+    return outputs, report
+
+def print_report(report):
+    print("\n--- Stage timings ---")
+    print(f"  {'stage':<28} {'seconds':>9} {'peak RSS MB':>12} {'traced MB':>10}")
+    for stage, elapsed, rss, traced in report:
+        traced_text = f"{traced:10.1f}" if traced is not None else f"{'-':>10}"
+        print(f"  {stage:<28} {elapsed:9.2f} {rss:12.1f} {traced_text}")
+    print(f"  {'total':<28} {sum(r[1] for r in report):9.2f}")
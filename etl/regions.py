@@ -0,0 +1,87 @@
+import pandas as pd
+
+# --- Country -> region mapping ---
+# Keys are normalized (lowercase) country names as produced by etl.countries;
+# region keys are fixed so reports can filter on them.
+REGIONS = {
+    1: 'Africa',
+    2: 'Asia',
+    3: 'Oceania',
+    4: 'Europe',
+    5: 'North America',
+    6: 'South America',
+    7: 'Antarctica',
+}
+
+# Countries not listed below (the old report's ELSE branch)
+DEFAULT_REGION_KEY = 7
+
+COUNTRY_REGIONS = {}
+
+# Africa
+COUNTRY_REGIONS.update(dict.fromkeys([
+    'algeria', 'angola', 'benin', 'botswana', 'burkina faso', 'burundi', 'cabo verde',
+    'cameroon', 'central african republic', 'chad', 'comoros', 'congo, dem. rep.',
+    'congo, rep.', "cote d'ivoire", 'djibouti', 'egypt, arab rep.', 'equatorial guinea',
+    'eritrea', 'eswatini', 'ethiopia', 'gabon', 'gambia, the', 'ghana', 'guinea',
+    'guinea-bissau', 'kenya', 'lesotho', 'liberia', 'libya', 'madagascar', 'malawi',
+    'mali', 'mauritania', 'mauritius', 'morocco', 'mozambique', 'namibia', 'niger',
+    'nigeria', 'rwanda', 'sao tome and principe', 'senegal', 'seychelles',
+    'sierra leone', 'somalia', 'south africa', 'south sudan', 'sudan', 'tanzania',
+    'togo', 'tunisia', 'uganda', 'zambia', 'zimbabwe',
+], 1))
+
+# Asia
+COUNTRY_REGIONS.update(dict.fromkeys([
+    'afghanistan', 'armenia', 'azerbaijan', 'bahrain', 'bangladesh', 'bhutan',
+    'brunei darussalam', 'cambodia', 'china', 'georgia', 'hong kong sar, china',
+    'india', 'indonesia', 'iran, islamic rep.', 'iraq', 'israel', 'japan', 'jordan',
+    'kazakhstan', 'korea, rep.', 'kuwait', 'kyrgyz republic', 'lao pdr', 'lebanon',
+    'malaysia', 'maldives', 'macao sar, china', 'mongolia', 'myanmar', 'nepal', 'oman',
+    'pakistan', 'palestine', 'philippines', 'qatar', 'saudi arabia', 'singapore',
+    'sri lanka', 'syrian arab republic', 'tajikistan', 'taiwan', 'thailand',
+    'timor-leste', 'turkmenistan', 'united arab emirates', 'uzbekistan', 'viet nam',
+    'yemen, rep.',
+], 2))
+
+# Oceania
+COUNTRY_REGIONS.update(dict.fromkeys([
+    'australia', 'fiji', 'kiribati', 'marshall islands', 'micronesia, fed. sts.',
+    'nauru', 'new zealand', 'palau', 'papua new guinea', 'samoa', 'solomon islands',
+    'tonga', 'tuvalu', 'vanuatu',
+], 3))
+
+# Europe
+COUNTRY_REGIONS.update(dict.fromkeys([
+    'albania', 'andorra', 'austria', 'belarus', 'belgium', 'bosnia and herzegovina',
+    'bulgaria', 'croatia', 'cyprus', 'czechia', 'denmark', 'estonia', 'finland',
+    'france', 'germany', 'greece', 'hungary', 'iceland', 'ireland', 'italy', 'kosovo',
+    'latvia', 'lithuania', 'luxembourg', 'malta', 'moldova', 'monaco', 'montenegro',
+    'netherlands', 'north macedonia', 'norway', 'poland', 'portugal', 'romania',
+    'russian federation', 'san marino', 'serbia', 'slovak republic', 'slovenia',
+    'spain', 'sweden', 'switzerland', 'turkiye', 'ukraine', 'united kingdom',
+], 4))
+
+# North America
+COUNTRY_REGIONS.update(dict.fromkeys([
+    'antigua and barbuda', 'aruba', 'bahamas, the', 'barbados', 'belize', 'canada',
+    'costa rica', 'cuba', 'dominica', 'dominican republic', 'el salvador', 'grenada',
+    'guatemala', 'haiti', 'honduras', 'jamaica', 'mexico', 'nicaragua', 'panama',
+    'puerto rico (us)', 'st. kitts and nevis', 'st. lucia',
+    'st. vincent and the grenadines', 'trinidad and tobago', 'united states',
+], 5))
+
+# South America
+COUNTRY_REGIONS.update(dict.fromkeys([
+    'argentina', 'bolivia', 'brazil', 'chile', 'colombia', 'ecuador', 'guyana',
+    'paraguay', 'peru', 'suriname', 'uruguay', 'venezuela, rb',
+], 6))
+
+
+def build_dim_region():
+    """Build dim_region from REGIONS."""
+    return pd.DataFrame({'region_key': list(REGIONS), 'region_name': list(REGIONS.values())})
+
+def region_keys(country_names):
+    """Map normalized country names to region keys."""
+    return country_names.map(COUNTRY_REGIONS).fillna(DEFAULT_REGION_KEY).astype(int)
@@ -0,0 +1,118 @@
+import time
+from sqlalchemy import text
+
+# --- Summary tables ---
+# Pre-aggregated copies of the reports.py aggregations, rebuilt after every
+# load so the dashboard reads a few hundred rows instead of scanning the fact
+# table. Each one is built as <name>_new and swapped in atomically.
+
+SUMMARY_TABLES = {
+    # Country x year metrics with the dimensions the report filters use;
+    # the cost of living rollup rows are computed from these at read time
+    'summary_country_year': """
+        SELECT
+            t.year_value,
+            c.country_name,
+            c.region_key,
+            q.cost_of_living_category,
+            q.climate_category,
+            AVG(q.cost_of_living_value) AS avg_cost_of_living,
+            AVG(q.purchasing_power_value) AS avg_purchasing_power,
+            AVG(q.climate_value) AS climate_value,
+            SUM(f.gdp_usd) AS total_gdp_usd,
+            ROUND(SUM(f.gdp_usd) / NULLIF(AVG(q.climate_value), 0), 2) AS development_efficiency_ratio
+        FROM fact_country_metrics f
+        JOIN dim_country c ON f.country_key = c.country_key
+        JOIN dim_time t ON f.time_key = t.time_key
+        JOIN dim_quality_of_life q ON f.country_key = q.country_key
+        GROUP BY t.year_value, c.country_name, c.region_key, q.cost_of_living_category, q.climate_category
+    """,
+    # One row per country (mean GDP per capita, latest population) joined to
+    # the country-grain category, as in traffic_commute_category_report
+    'summary_category': """
+        SELECT q.traffic_commute_category,
+            AVG(cf.avg_gdp_per_capita) AS avg_gdp_per_capita,
+            SUM(f.population) AS total_population,
+            CASE
+                WHEN q.traffic_commute_category LIKE '%Very High%' THEN 1
+                WHEN q.traffic_commute_category LIKE '%High%' THEN 2
+                WHEN q.traffic_commute_category LIKE '%Moderate%' THEN 3
+                WHEN q.traffic_commute_category LIKE '%Low%' AND q.traffic_commute_category NOT LIKE '%Very%' THEN 4
+                WHEN q.traffic_commute_category LIKE '%Very Low%' THEN 5
+                ELSE 6
+            END AS sort_order
+        FROM (
+            SELECT f.country_key,
+                AVG(f.gdp_per_capita) AS avg_gdp_per_capita,
+                MAX(CASE WHEN f.population > 0 THEN f.time_key END) AS latest_time_key
+            FROM fact_country_metrics f
+            GROUP BY f.country_key
+        ) cf
+        JOIN dim_quality_of_life q ON cf.country_key = q.country_key
+        LEFT JOIN fact_country_metrics f ON f.country_key = cf.country_key AND f.time_key = cf.latest_time_key
+        GROUP BY q.traffic_commute_category
+    """,
+    'summary_region': """
+        SELECT
+            r.region_key,
+            r.region_name AS region,
+            ROUND(AVG(q.quality_of_life_value), 2) AS avg_quality_of_life_index
+        FROM dim_quality_of_life q
+        JOIN dim_country c ON q.country_key = c.country_key
+        JOIN dim_region r ON c.region_key = r.region_key
+        GROUP BY r.region_key, r.region_name
+    """,
+    # Snapshot of the latest year that has both GDP and population
+    'summary_latest_year': """
+        SELECT
+            c.country_name,
+            c.region_key,
+            q.quality_of_life_category,
+            f.population,
+            f.gdp_usd,
+            f.time_key
+        FROM fact_country_metrics f
+        JOIN dim_country c ON f.country_key = c.country_key
+        LEFT JOIN dim_quality_of_life q ON f.country_key = q.country_key
+        WHERE f.time_key = (
+            SELECT MAX(f2.time_key)
+            FROM fact_country_metrics f2
+            WHERE f2.gdp_usd > 0 AND f2.population > 0
+        )
+    """,
+}
+
+def swap_table(connection, name):
+    """Replace name with the freshly built name_new."""
+    exists = connection.dialect.has_table(connection, name)
+    if connection.dialect.name == 'mysql':
+        # A multi-table RENAME is atomic: readers see the old or the new table
+        if exists:
+            connection.execute(text(f"RENAME TABLE {name} TO {name}_old, {name}_new TO {name}"))
+            connection.execute(text(f"DROP TABLE {name}_old"))
+        else:
+            connection.execute(text(f"RENAME TABLE {name}_new TO {name}"))
+    else:
+        if exists:
+            connection.execute(text(f"DROP TABLE {name}"))
+        connection.execute(text(f"ALTER TABLE {name}_new RENAME TO {name}"))
+
+def refresh_summaries(engine, summaries=SUMMARY_TABLES):
+    """Rebuild every summary table from the loaded warehouse tables."""
+    print("\n--- Refreshing summary tables ---")
+    timings = {}
+    with engine.begin() as connection:
+        for name, query in summaries.items():
+            start = time.perf_counter()
+            connection.execute(text(f"DROP TABLE IF EXISTS {name}_new"))
+            connection.execute(text(f"CREATE TABLE {name}_new AS {query}"))
+            swap_table(connection, name)
+            timings[name] = time.perf_counter() - start
+            print(f"  {name:<24} {timings[name]:8.2f} s")
+    return timings
+
+def drop_summaries(engine, summaries=SUMMARY_TABLES):
+    """Drop the summary tables so reports fall back to the live aggregations."""
+    with engine.begin() as connection:
+        for name in summaries:
+            connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
@@ -0,0 +1,237 @@
+import re
+import numpy as np
+import pandas as pd
+
+from .countries import normalize_source, unmapped_countries
+from .regions import region_keys
+
+# --- Derived metrics ---
+# Computed over the whole fact frame in one vectorized pass, in order, so a
+# definition may use a column produced by an earlier one.
+#   ratio:  numerator * scale / denominator, 0 where the denominator <= 0
+#   growth: relative change from the country's previous calendar year
+#           (year - 1), 0 if the country has no row for that year
+#   delta:  absolute change from the country's previous calendar year, 0 if
+#           the country has no row for that year
+# DERIVED_METRICS are the ones build_fact loads into fact_country_metrics.
+DERIVED_METRICS = [
+    {'name': 'gdp_per_capita', 'kind': 'ratio', 'numerator': 'gdp_usd', 'denominator': 'population', 'scale': 1_000_000},
+]
+# Opt-in, for analysis outside the warehouse (which has no columns for them):
+# compute_derived_metrics(df, DERIVED_METRICS + YEAR_OVER_YEAR_METRICS)
+YEAR_OVER_YEAR_METRICS = [
+    {'name': 'gdp_growth_yoy', 'kind': 'growth', 'column': 'gdp_usd'},
+    {'name': 'population_growth_yoy', 'kind': 'growth', 'column': 'population'},
+    {'name': 'gdp_per_capita_delta', 'kind': 'delta', 'column': 'gdp_per_capita'},
+]
+
+# --- Quality of Life column schema ---
+# source column -> (warehouse column, dtype, characters stripped before
+# parsing, default for missing or unparseable values)
+QUALITY_SCHEMA = {
+    'Purchasing Power Value': ('purchasing_power_value', 'float64', ',', 0.0),
+    'Safety Value': ('safety_value', 'float64', ',', 0.0),
+    'Health Care Value': ('health_care_value', 'float64', ',', 0.0),
+    'Climate Value': ('climate_value', 'float64', ',', 0.0),
+    'Cost of Living Value': ('cost_of_living_value', 'float64', ',', 0.0),
+    'Property Price to Income Value': ('property_price_income_value', 'float64', ',', 0.0),
+    'Traffic Commute Time Value': ('traffic_commute_value', 'float64', ',', 0.0),
+    'Pollution Value': ('pollution_value', 'float64', ',', 0.0),
+    # Quality of Life Value has a weird format with colons and quotes (": 104.16")
+    'Quality of Life Value': ('quality_of_life_value', 'float64', ":'", 0.0),
+    'Purchasing Power Category': ('purchasing_power_category', 'category', None, 'None'),
+    'Safety Category': ('safety_category', 'category', None, 'None'),
+    'Health Care Category': ('health_care_category', 'category', None, 'None'),
+    'Climate Category': ('climate_category', 'category', None, 'None'),
+    'Cost of Living Category': ('cost_of_living_category', 'category', None, 'None'),
+    'Property Price to Income Category': ('property_price_income_category', 'category', None, 'None'),
+    'Traffic Commute Time Category': ('traffic_commute_category', 'category', None, 'None'),
+    'Pollution Category': ('pollution_category', 'category', None, 'None'),
+    'Quality of Life Category': ('quality_of_life_category', 'category', None, 'None'),
+}
+
+def clean_quality_frame(df, schema=QUALITY_SCHEMA):
+    """Clean and type all schema columns of the Quality of Life frame.
+
+    Value columns that share a strip rule are cleaned with one regex replace
+    over the whole block, then parsed with to_numeric; category columns
+    become pandas categoricals. Missing or bad values take the default.
+    """
+    present = {col: spec for col, spec in schema.items() if col in df.columns}
+
+    by_rule = {}
+    for col, (_, dtype, strip, _) in present.items():
+        if dtype != 'category':
+            by_rule.setdefault(strip or '', []).append(col)
+    for strip, cols in by_rule.items():
+        block = df[cols].astype(str).replace(f'[{re.escape(strip)}\\s]', '', regex=True)
+        block = block.apply(pd.to_numeric, errors='coerce')
+        df[cols] = block.fillna({col: present[col][3] for col in cols}).astype({col: present[col][1] for col in cols})
+
+    category_cols = [col for col, spec in present.items() if spec[1] == 'category']
+    df[category_cols] = df[category_cols].fillna({col: present[col][3] for col in category_cols}).astype('category')
+    return df
+
+def previous_year_rows(df, group_col='country_key', order_col='year_value'):
+    """Position of each row's same-group row for order_col - 1, or -1."""
+    groups = df[group_col].to_numpy(dtype=float)
+    years = df[order_col].to_numpy(dtype=float)
+    order = np.lexsort((years, groups))
+    # Neighbours in (group, year) order that are one calendar year apart;
+    # NaN groups never match, so they have no previous year
+    follows = (groups[order[1:]] == groups[order[:-1]]) & (years[order[1:]] == years[order[:-1]] + 1)
+    previous = np.full(len(df), -1, dtype=np.intp)
+    previous[order[1:][follows]] = order[:-1][follows]
+    return previous
+
+def compute_derived_metrics(df, metrics=DERIVED_METRICS, group_col='country_key', order_col='year_value'):
+    """Add one column per metric definition to df using array math."""
+    previous_row = None
+    for metric in metrics:
+        name, kind = metric['name'], metric['kind']
+        if kind == 'ratio':
+            numerator = df[metric['numerator']].to_numpy(dtype=float) * metric.get('scale', 1)
+            denominator = df[metric['denominator']].to_numpy(dtype=float)
+            df[name] = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+        elif kind in ('growth', 'delta'):
+            if previous_row is None:
+                previous_row = previous_year_rows(df, group_col, order_col)
+            current = df[metric['column']].to_numpy(dtype=float)
+            previous = np.where(previous_row >= 0, current[previous_row], np.nan)
+            change = current - previous
+            if kind == 'delta':
+                df[name] = np.where(np.isnan(previous), 0.0, change)
+            else:
+                df[name] = np.divide(change, previous, out=np.zeros_like(change), where=previous > 0)
+        else:
+            raise ValueError(f"Unknown derived metric kind '{kind}' for {name}")
+    return df
+
+def normalize(frames):
+    """Normalize stage: make sure every source frame has country_norm and
+    report Quality of Life countries that have no GDP counterpart.
+    """
+    for source, df in frames.items():
+        if 'country_norm' not in df.columns:
+            normalize_source(source, df)
+
+    quality_df, gdp_df, pop_df = frames['quality'], frames['gdp'], frames['population']
+    print("--- Preview ---")
+    print("Unique countries → Quality:", quality_df['country_norm'].nunique(),
+          " | GDP:", gdp_df['country_norm'].nunique(),
+          " | Population:", pop_df['country_norm'].nunique())
+
+    unmatched_quality = unmapped_countries(quality_df['country'], gdp_df['country_norm'])
+    print(f"Quality countries with no GDP match ({len(unmatched_quality)}):", unmatched_quality)
+    return frames
+
+def build_dim_country(gdp_df, pop_df):
+    """Build dim_country (lowercase normalized names) from the GDP countries,
+    with ISO codes taken from the population feed and the region key from
+    etl.regions.
+    """
+    all_countries = gdp_df[['country_norm']].drop_duplicates().reset_index(drop=True).rename(columns={'country_norm': 'country_name'})
+    all_countries['country_key'] = all_countries.index + 1
+
+    country_codes = pop_df[['country_norm', 'Country Code']].drop_duplicates().rename(columns={'country_norm': 'country_name'})
+    all_countries = pd.merge(all_countries, country_codes, how='left', on='country_name')
+    all_countries.rename(columns={'Country Code': 'country_code'}, inplace=True)
+
+    # --- Add Kosovo manually if missing ---
+    if 'kosovo' not in all_countries['country_name'].values:
+        new_key = all_countries['country_key'].max() + 1
+        all_countries = pd.concat([
+            all_countries,
+            pd.DataFrame([{'country_key': new_key, 'country_name': 'kosovo', 'country_code': 'XKX'}])
+        ], ignore_index=True)
+
+    dim_country = (
+        all_countries[['country_key', 'country_name', 'country_code']]
+        .dropna(subset=['country_code'])
+        .copy()
+    )
+    dim_country['region_key'] = region_keys(dim_country['country_name'])
+    return dim_country
+
+def build_dim_time(gdp_df, pop_df):
+    """Build dim_time from every year present in the GDP or population feed."""
+    gdp_years = pd.to_numeric(gdp_df['Year'], errors='coerce').dropna().unique()
+    pop_years = pd.to_numeric(pop_df['Year'], errors='coerce').dropna().unique()
+
+    # 🔍 DEBUG: Check what years are in each dataset
+    print("GDP years:", sorted(gdp_years))
+    print("POP years:", sorted(pop_years))
+
+    all_years = sorted(set(gdp_years) | set(pop_years) | {2025})
+    dim_time = pd.DataFrame({'time_key': all_years, 'year_value': all_years})
+    dim_time['is_historical'] = dim_time['year_value'] < 2025
+    dim_time['period_type'] = 'Annual'
+    return dim_time
+
+def build_dim_quality_of_life(quality_df, dim_country):
+    """Clean the Quality of Life frame and key it to dim_country."""
+    print("\n--- DEBUG: Raw Quality of Life Values ---")
+    print(quality_df[['country', 'Quality of Life Value']].head(15))
+
+    print("\n--- Cleaning Quality of Life Values ---")
+    quality_df = clean_quality_frame(quality_df.copy())
+
+    print("\n--- AFTER CLEANING Quality of Life Values ---")
+    print(quality_df[['country', 'Quality of Life Value']].head(15))
+    print(f"Non-zero values: {(quality_df['Quality of Life Value'] > 0).sum()}")
+
+    dim_quality_of_life = pd.merge(
+        quality_df,
+        dim_country[['country_key', 'country_name']].rename(columns={'country_name': 'country_name_norm'}),
+        how='left',
+        left_on='country_norm',
+        right_on='country_name_norm'
+    )
+
+    dim_quality_of_life = dim_quality_of_life[dim_quality_of_life['country_key'].notna()].copy()
+    dim_quality_of_life = dim_quality_of_life.drop(columns=[c for c in ['country', 'country_norm', 'country_name_norm', 'country_code'] if c in dim_quality_of_life.columns])
+    dim_quality_of_life.rename(columns={col: spec[0] for col, spec in QUALITY_SCHEMA.items()}, inplace=True)
+    return dim_quality_of_life
+
+def build_fact(gdp_df, pop_df, dim_country, dim_time, metrics=DERIVED_METRICS):
+    """Join GDP and population per country-year, key the rows to the
+    dimensions and add the derived metrics.
+    """
+    pop_df = pop_df.assign(
+        country_norm=pop_df['country_norm'].astype(str),
+        Year=pd.to_numeric(pop_df['Year'], errors='coerce'),
+    )
+    gdp_df = gdp_df.assign(
+        country_norm=gdp_df['country_norm'].astype(str),
+        Year=pd.to_numeric(gdp_df['Year'], errors='coerce'),
+    )
+
+    fact_df = pd.merge(
+        pop_df,
+        gdp_df,
+        how='right',
+        left_on=['country_norm', 'Year'],
+        right_on=['country_norm', 'Year'],
+        suffixes=('_pop', '_gdp')
+    )
+
+    fact_df = pd.merge(
+        fact_df,
+        dim_country.rename(columns={'country_name': 'country_norm'}),
+        how='left',
+        left_on='country_norm',
+        right_on='country_norm'
+    )
+    fact_df = pd.merge(fact_df, dim_time, how='left', left_on='Year', right_on='year_value')
+
+    fact_df.rename(columns={'Population': 'population', 'Value': 'gdp_usd'}, inplace=True)
+    fact_df['population'] = pd.to_numeric(fact_df['population'], errors='coerce').fillna(0)
+    fact_df['gdp_usd'] = pd.to_numeric(fact_df['gdp_usd'], errors='coerce').fillna(0)
+    fact_df = compute_derived_metrics(fact_df, metrics)
+    fact_country_metrics = fact_df[['country_key', 'time_key', 'gdp_usd', 'population', 'gdp_per_capita']].copy()
+
+    before_count = len(fact_country_metrics)
+    fact_country_metrics = fact_country_metrics.dropna(subset=['country_key'])
+    after_count = len(fact_country_metrics)
+    print(f"Removed {before_count - after_count} rows with missing country_key from fact_country_metrics")
+    return fact_country_metrics
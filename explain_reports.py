@@ -0,0 +1,136 @@
+# explain_reports.py
+# Runs EXPLAIN on every query issued by the reports.py report functions and
+# fails (exit status 1) when a large table is read with a full scan where
+# an index is expected. Both the summary-table and the live query of each
+# report are checked, with the default arguments and with each filter.
+import inspect
+import re
+import sys
+from sqlalchemy import event
+
+import reports
+
+# Tables that must be reached through an index (dimensions and summary
+# tables are small enough that a scan is fine)
+INDEXED_TABLES = {'fact_country_metrics'}
+
+# Reports that aggregate every fact row, where a full scan is the right plan
+FULL_SCAN_OK = {
+    'cost_of_living_vs_purchasing_power_report',
+    'traffic_commute_category_report',
+}
+
+# Filtered calls checked besides the default arguments, for the reports
+# that take the filter; these are expected to use an index in every report
+FILTER_VARIANTS = [
+    {'year_range': (2015, 2020)},
+    {'countries': ['Japan', 'Philippines']},
+]
+
+SQL_KEYWORDS = {'on', 'where', 'join', 'left', 'right', 'inner', 'cross', 'group', 'order',
+                'having', 'limit', 'union', 'using', 'natural'}
+
+
+def report_functions():
+    # Every report is wrapped by the report cache
+    return [getattr(reports, name) for name in dir(reports)
+            if name.endswith('_report') and hasattr(getattr(reports, name), 'uncached')]
+
+def call_variants(report):
+    """The default call ({}) and the FILTER_VARIANTS report accepts."""
+    accepted = inspect.signature(report.uncached).parameters
+    return [{}] + [kwargs for kwargs in FILTER_VARIANTS if set(kwargs) <= set(accepted)]
+
+def table_aliases(statement):
+    """Map every alias (and table name) in FROM/JOIN clauses to its table."""
+    aliases = {}
+    for table, alias in re.findall(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', statement, re.I):
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+def capture_queries(report, use_summaries, kwargs):
+    """Run report once and return the (statement, parameters) it executed."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Skip the DESCRIBE/PRAGMA behind summary_available()
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            statements.append((statement, parameters))
+
+    summary_available = reports.summary_available
+    reports.summary_available = lambda table: use_summaries and summary_available(table)
+    event.listen(reports.dw_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        report.uncached(**kwargs)
+    except Exception:
+        pass  # the statement was captured; EXPLAIN reports the error
+    finally:
+        event.remove(reports.dw_engine, 'before_cursor_execute', before_cursor_execute)
+        reports.summary_available = summary_available
+    return statements
+
+def full_scans(connection, statement, parameters):
+    """Return the aliases the plan reads with a full table scan."""
+    if connection.dialect.name == 'sqlite':
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        # 'SCAN f USING [COVERING] INDEX ...' still reads every row of f, in
+        # index order; only 'SEARCH f USING ...' is a lookup
+        return [row[3].split()[1] for row in plan if row[3].startswith('SCAN ')]
+    plan = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().fetchall()
+    # 'index' is a full scan of an index, 'ALL' of the table
+    return [row['table'] for row in plan if row['type'] in ('ALL', 'index')]
+
+def check_report(report):
+    """EXPLAIN every query of report; returns a list of failure messages."""
+    name = report.__name__
+    failures = []
+    seen = set()
+    for kwargs in call_variants(report):
+        # Aggregating every fact row needs a full scan, a filtered call does not
+        full_scan_ok = name in FULL_SCAN_OK and not kwargs
+        for use_summaries in (True, False):
+            for statement, parameters in capture_queries(report, use_summaries, kwargs):
+                if (statement, full_scan_ok) in seen:
+                    continue
+                seen.add((statement, full_scan_ok))
+                aliases = table_aliases(statement)
+                call = ', '.join(f'{key}={value!r}' for key, value in kwargs.items()) or 'defaults'
+                try:
+                    with reports.dw_engine.connect() as connection:
+                        scanned = full_scans(connection, statement, parameters)
+                except Exception as e:
+                    failures.append(f"could not EXPLAIN ({call}): {str(e).splitlines()[0]}")
+                    continue
+                for alias in scanned:
+                    table = aliases.get(alias, alias)
+                    if table in INDEXED_TABLES and not full_scan_ok:
+                        failures.append(f"full scan of {table} (as {alias}, {call})")
+    return failures
+
+def run_checks():
+    print("🔎 EXPLAIN check of reports.py queries")
+    print("=" * 60)
+    dialect = reports.dw_engine.dialect.name
+    if dialect not in ('mysql', 'sqlite'):
+        # DuckDB has no index access paths to check; it prunes columnar scans
+        print(f"Skipped: no index checks for {dialect}")
+        return True
+    failed = 0
+    for report in report_functions():
+        failures = check_report(report)
+        if failures:
+            failed += 1
+            print(f"❌ {report.__name__}")
+            for failure in failures:
+                print(f"   ↳ {failure}")
+        else:
+            print(f"✓ {report.__name__}")
+    print("=" * 60)
+    print(f" Failed: {failed}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
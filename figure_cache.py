@@ -0,0 +1,123 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+
+from report_cache import forget_all, load_version, memory_cache, recall, remember, warehouse_key
+
+# --- Dash callback figure cache ---
+# Figures built by the dashboard callbacks, stored as Plotly JSON and keyed
+# on callback name + the selected countries (as a set: order and duplicates
+# do not change the figure) + the warehouse and its load version (see
+# report_cache.py), so an entry stays valid until the next ETL load.
+FIGURE_CACHE_ENTRIES = int(os.environ.get('FIGURE_CACHE_ENTRIES', '256'))
+# SQLite file shared by every worker process on the host; set
+# FIGURE_CACHE_DB= (empty) to keep the cache in memory only.
+FIGURE_CACHE_DB = os.environ.get('FIGURE_CACHE_DB', '.figure_cache.sqlite')
+
+_memory = memory_cache(FIGURE_CACHE_ENTRIES)  # key -> figure JSON
+_inflight = {}  # key -> [lock, callers], one computation per key at a time
+_lock = threading.Lock()
+
+
+def selection_key(selected):
+    """Order- and duplicate-insensitive key for a dropdown selection; None
+    (every country) is kept apart from an empty selection.
+    """
+    return json.dumps(None if selected is None else sorted(set(selected)))
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=5)
+    connection.execute("PRAGMA journal_mode=WAL")
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(figure_cache)")]
+    if columns and 'warehouse' not in columns:
+        # A cache file from before figures were keyed on the warehouse
+        connection.execute("DROP TABLE figure_cache")
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS figure_cache (
+            name TEXT, selection TEXT, warehouse TEXT, load_version TEXT, figure TEXT,
+            PRIMARY KEY (name, selection, warehouse, load_version)
+        )
+    """)
+    return connection
+
+def read_shared(path, name, selection, warehouse, version):
+    """Return the figure JSON stored by any worker, or None on a miss."""
+    try:
+        with _connect(path) as connection:
+            row = connection.execute(
+                "SELECT figure FROM figure_cache "
+                "WHERE name = ? AND selection = ? AND warehouse = ? AND load_version = ?",
+                (name, selection, warehouse, version)).fetchone()
+    except sqlite3.Error as e:
+        print(f"WARNING: could not read the figure cache ({e})")
+        return None
+    return row[0] if row else None
+
+def write_shared(path, name, selection, warehouse, version, figure_json):
+    """Store a figure and drop that callback's figures from older loads of
+    the same warehouse.
+    """
+    try:
+        with _connect(path) as connection:
+            connection.execute("INSERT OR REPLACE INTO figure_cache VALUES (?, ?, ?, ?, ?)",
+                               (name, selection, warehouse, version, figure_json))
+            connection.execute("DELETE FROM figure_cache WHERE name = ? AND warehouse = ? AND load_version <> ?",
+                               (name, warehouse, version))
+    except sqlite3.Error as e:
+        print(f"WARNING: could not cache figure {name} ({e})")
+
+def clear_figure_cache(path=FIGURE_CACHE_DB):
+    """Empty the in-memory cache and the shared SQLite table."""
+    forget_all(_memory)
+    if path and os.path.exists(path):
+        with _connect(path) as connection:
+            connection.execute("DELETE FROM figure_cache")
+
+def cached_figure(engine, path=FIGURE_CACHE_DB):
+    """Decorator caching a callback's figure per country selection, warehouse
+    and load version. The callback takes the selection as its only argument.
+
+    Hits are served from memory, then from the shared SQLite file. Callers
+    with the same key wait for one computation instead of repeating it.
+    Figures are returned as Plotly JSON dicts, which Dash accepts as is.
+    """
+    warehouse = warehouse_key(engine)
+
+    def decorator(callback):
+        name = callback.__name__
+
+        @functools.wraps(callback)
+        def wrapper(selected):
+            version = load_version(engine)
+            if version is None:
+                return callback(selected)
+
+            selection = selection_key(selected)
+            key = (name, warehouse, version, selection)
+            with _lock:
+                inflight = _inflight.setdefault(key, [threading.Lock(), 0])
+                inflight[1] += 1
+            try:
+                with inflight[0]:
+                    figure_json = recall(_memory, key)
+                    if figure_json is None and path:
+                        figure_json = read_shared(path, name, selection, warehouse, version)
+                        if figure_json is not None:
+                            remember(_memory, key, figure_json)
+                    if figure_json is None:
+                        figure_json = callback(selected).to_json()
+                        remember(_memory, key, figure_json)
+                        if path:
+                            write_shared(path, name, selection, warehouse, version, figure_json)
+            finally:
+                with _lock:
+                    inflight[1] -= 1
+                    if not inflight[1]:
+                        del _inflight[key]
+            return json.loads(figure_json)
+
+        wrapper.uncached = callback
+        return wrapper
+    return decorator
@@ -1,21 +1,32 @@
 # functional_test.py
+import inspect
 import pandas as pd
 import time
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+import reports
+from query_metrics import print_metrics
+from db import create_pooled_engine, get_engine
+from etl.load import WAREHOUSE_TABLES, load
 from reports import (
     gdp_population_correlation_report,
     cost_of_living_vs_purchasing_power_report,
     climate_quality_vs_economic_development_report,
     traffic_commute_category_report,
+    quality_of_life_by_region_report,
 )
 
 # --- Database connection configuration ---
-dw_username = "root"
-dw_password = "password"  #adjust this
-dw_host = "localhost"
-dw_database = "country_data_warehouse"
+# Shared with reports.py; set DW_URL or db.ini to point at your warehouse
+dw_engine = get_engine()
 
-dw_engine = create_engine(f"mysql+pymysql://{dw_username}:{dw_password}@{dw_host}/{dw_database}")
+# Embedded backends the synthetic tests run on (no server needed)
+EMBEDDED_URLS = {'SQLite': 'sqlite://'}
+try:
+    import duckdb_engine  # optional
+    EMBEDDED_URLS['DuckDB'] = 'duckdb:///:memory:'
+except ImportError:
+    pass
 
 # Store test results
 test_results = []
@@ -41,7 +52,11 @@ def verify_connection():
     print("🔌 Testing database connection...")
     try:
         with dw_engine.connect() as conn:
-            db_name = conn.execute(text("SELECT DATABASE();")).scalar()
+            if conn.dialect.name == 'mysql':
+                db_name = conn.execute(text("SELECT DATABASE();")).scalar()
+            else:
+                conn.execute(text("SELECT 1")).scalar()
+                db_name = f"{conn.dialect.name}:{dw_engine.url.database or ':memory:'}"
             print(f" Connected to database: {db_name}\n")
             return True
     except Exception as e:
@@ -52,11 +67,11 @@ def verify_connection():
 # --- Individual Tests ---
 def timed_test(func):
     """Decorator to measure and handle each test execution."""
-    def wrapper(test_name):
+    def wrapper(test_name, *args):
         print(f"=== Testing {test_name} ===")
         start = time.time()
         try:
-            func()
+            func(*args)
             elapsed = (time.time() - start) * 1000
             print(f"✓ {test_name} passed in {elapsed:.2f} ms\n")
             log_result(test_name, True, elapsed)
@@ -119,21 +134,231 @@ def test_traffic_commute_category():
     assert {'traffic_commute_category', 'avg_gdp_per_capita', 'total_population'}.issubset(df.columns)
 
 
+# --- Synthetic dataset regression tests (no MySQL needed) ---
+def synthetic_tables():
+    """Alpha has 3 years of history, Beta only 2022, both with 'High'
+    traffic. Exposes fan-out joins between the per-year fact and the
+    per-country quality attributes.
+    """
+    return {
+        'dim_region': pd.DataFrame({'region_key': [2, 4], 'region_name': ['Asia', 'Europe']}),
+        'dim_country': pd.DataFrame({
+            'country_key': [1, 2], 'country_name': ['Alpha', 'Beta'],
+            'country_code': ['ALP', 'BET'], 'region_key': [2, 4],
+        }),
+        'dim_time': pd.DataFrame({'time_key': [2020, 2021, 2022], 'year_value': [2020, 2021, 2022]}),
+        'dim_quality_of_life': pd.DataFrame({
+            'country_key': [1, 2],
+            'cost_of_living_value': [40.0, 60.0], 'purchasing_power_value': [80.0, 40.0],
+            'climate_value': [50.0, 50.0], 'quality_of_life_value': [100.0, 150.0],
+            'traffic_commute_category': ['High', 'High'], 'cost_of_living_category': ['Low', 'Moderate'],
+            'climate_category': ['Moderate', 'Moderate'], 'quality_of_life_category': ['Moderate', 'High'],
+        }),
+        'fact_country_metrics': pd.DataFrame({
+            'country_key': [1, 1, 1, 2], 'time_key': [2020, 2021, 2022, 2022],
+            'gdp_usd': [1000.0, 2200.0, 3600.0, 50000.0], 'population': [100, 110, 120, 1000],
+            'gdp_per_capita': [10.0, 20.0, 30.0, 50.0],
+        }),
+    }
+
+
+def synthetic_warehouse(url='sqlite://', summaries=False):
+    """In-memory warehouse with synthetic_tables() loaded through the ETL."""
+    engine = create_pooled_engine(url, poolclass=StaticPool)
+    load(synthetic_tables(), engine, refresh_mode='full', summaries=summaries)
+    return engine
+
+
+def run_on_engine(engine, report, **kwargs):
+    """Run a report's uncached query against engine instead of the warehouse."""
+    warehouse_engine = reports.dw_engine
+    reports.dw_engine = engine
+    try:
+        return report.uncached(**kwargs)
+    finally:
+        reports.dw_engine = warehouse_engine
+
+
+def check_fanout_results(engine):
+    traffic = run_on_engine(engine, traffic_commute_category_report)
+    high = traffic.set_index('traffic_commute_category').loc['High']
+    # Latest population per country (120 + 1000), not summed across years
+    assert high['total_population'] == 1120, f"total_population {high['total_population']} != 1120"
+    # Each country weighs once: mean(mean(10, 20, 30), 50)
+    assert high['avg_gdp_per_capita'] == 35, f"avg_gdp_per_capita {high['avg_gdp_per_capita']} != 35"
+
+    cost = run_on_engine(engine, cost_of_living_vs_purchasing_power_report)
+    total = cost[cost['year_value'].isna() & cost['country_name'].isna()]
+    assert len(total) == 1, "Expected one grand-total row"
+    assert total['avg_cost_of_living'].iloc[0] == 50, "Grand total should average each country once"
+    assert total['avg_purchasing_power'].iloc[0] == 60, "Grand total should average each country once"
+    year_2022 = cost[(cost['year_value'] == 2022) & cost['country_name'].isna()]
+    assert year_2022['avg_cost_of_living'].iloc[0] == 50, "2022 subtotal should cover Alpha and Beta"
+    alpha = cost[cost['country_name'] == 'Alpha']
+    assert len(alpha) == 3 and (alpha['avg_cost_of_living'] == 40).all(), "Alpha should have one row per year"
+
+
+@timed_test
+def test_fanout_regression_live_queries(url):
+    check_fanout_results(synthetic_warehouse(url))
+
+
+@timed_test
+def test_fanout_regression_summary_tables(url):
+    check_fanout_results(synthetic_warehouse(url, summaries=True))
+
+
+@timed_test
+def test_streamed_compact_reads(url):
+    engine = synthetic_warehouse(url)
+    full = run_on_engine(engine, cost_of_living_vs_purchasing_power_report)
+    chunks = list(run_on_engine(engine, cost_of_living_vs_purchasing_power_report, chunksize=2, dtypes='compact'))
+    assert all(len(chunk) <= 2 for chunk in chunks), "Chunks should hold at most chunksize rows"
+    assert sum(len(chunk) for chunk in chunks) == len(full), "Streamed rows should match the full result"
+    assert all(str(chunk['year_value'].dtype) == 'Int16' for chunk in chunks), "Years should be downcast to Int16"
+    assert all(str(chunk['country_name'].dtype) == 'category' for chunk in chunks), "Country names should be categorical"
+    # Aggregate incrementally over the detail rows
+    streamed = sum(chunk.loc[chunk['country_name'].notna(), 'avg_cost_of_living'].sum() for chunk in chunks)
+    assert streamed == full.loc[full['country_name'].notna(), 'avg_cost_of_living'].sum(), \
+        "Incremental sum should match the full result"
+
+
+# Each report with a filter on each of its dimensions (and its own category
+# column) over synthetic_tables()
+FILTERED_CALLS = [
+    (report, kwargs)
+    for report, category in [
+        (gdp_population_correlation_report, 'High'),
+        (cost_of_living_vs_purchasing_power_report, 'Low'),
+        (climate_quality_vs_economic_development_report, 'Moderate'),
+        (traffic_commute_category_report, 'High'),
+        (quality_of_life_by_region_report, 'Moderate'),
+    ]
+    for kwargs in [{'year_range': (2021, 2022)}, {'countries': ['Alpha']}, {'region': 'Europe'},
+                   {'category': category}]
+    if set(kwargs) <= set(inspect.signature(report.uncached).parameters)
+]
+
+
+def comparable(df):
+    return df.sort_values(list(df.columns), na_position='first').reset_index(drop=True)
+
+
+@timed_test
+def test_report_filters(url):
+    engine = synthetic_warehouse(url)
+
+    def countries(report, **kwargs):
+        df = run_on_engine(engine, report, **kwargs)
+        return sorted(df['country_name'].dropna().unique())
+
+    assert countries(cost_of_living_vs_purchasing_power_report, countries=['Alpha']) == ['Alpha'], \
+        "countries should keep only Alpha"
+    assert countries(cost_of_living_vs_purchasing_power_report, region='Europe') == ['Beta'], \
+        "region should keep only the European country"
+    assert countries(cost_of_living_vs_purchasing_power_report, category='Low') == ['Alpha'], \
+        "category should keep only the low cost of living country"
+    assert countries(gdp_population_correlation_report, category='High') == ['Beta'], \
+        "category should keep only the high quality of life country"
+    years = run_on_engine(engine, cost_of_living_vs_purchasing_power_report, year_range=(2021, 2022))['year_value']
+    assert sorted(years.dropna().unique()) == [2021, 2022], "year_range should keep only 2021 and 2022"
+    traffic = run_on_engine(engine, traffic_commute_category_report, countries=['Beta'])
+    assert traffic['total_population'].tolist() == [1000], "countries should limit the category totals to Beta"
+
+
+@timed_test
+def test_report_filters_summary_vs_live(url):
+    live = synthetic_warehouse(url)
+    summary = synthetic_warehouse(url, summaries=True)
+    for report, kwargs in FILTERED_CALLS:
+        expected = comparable(run_on_engine(live, report, **kwargs))
+        actual = comparable(run_on_engine(summary, report, **kwargs))
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False, obj=f"{report.__name__}({kwargs})")
+
+
+@timed_test
+def test_report_columns(url):
+    engine = synthetic_warehouse(url)
+    df = run_on_engine(engine, cost_of_living_vs_purchasing_power_report, columns=['avg_cost_of_living'])
+    assert list(df.columns) == ['year_value', 'country_name', 'avg_cost_of_living'], \
+        f"Unrequested measures should be dropped, got {list(df.columns)}"
+    df = run_on_engine(engine, traffic_commute_category_report, columns=[])
+    assert list(df.columns) == ['traffic_commute_category', 'sort_order'], "columns=[] should keep only the keys"
+    try:
+        run_on_engine(engine, cost_of_living_vs_purchasing_power_report, columns=['gdp_usd'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown columns should raise ValueError")
+
+
+@timed_test
+def test_incremental_refresh(url):
+    engine = synthetic_warehouse(url)
+    # Beta is dropped from the sources, Gamma added and Alpha's 2022 GDP revised
+    tables = synthetic_tables()
+    tables['dim_country'] = pd.DataFrame({
+        'country_key': [1, 3], 'country_name': ['Alpha', 'Gamma'],
+        'country_code': ['ALP', 'GAM'], 'region_key': [2, 4],
+    })
+    quality = tables['dim_quality_of_life']
+    tables['dim_quality_of_life'] = pd.concat([quality[quality['country_key'] == 1],
+                                               quality[quality['country_key'] == 2].assign(country_key=3)])
+    fact = tables['fact_country_metrics']
+    fact = pd.concat([fact[fact['country_key'] == 1], fact[fact['country_key'] == 2].assign(country_key=3)])
+    fact.loc[(fact['country_key'] == 1) & (fact['time_key'] == 2022), 'gdp_usd'] = 4800.0
+    tables['fact_country_metrics'] = fact
+    # Every column the ETL produces, NULL where the synthetic data has none
+    tables = {table: df.reindex(columns=[col for cols in WAREHOUSE_TABLES[table] for col in cols])
+              for table, df in tables.items()}
+    load(tables, engine, refresh_mode='incremental')
+
+    def warehouse(engine):
+        return {
+            table: pd.read_sql(text(f"SELECT * FROM {table} ORDER BY {', '.join(key_cols)}"), engine)
+            for table, key_cols in [('dim_country', ['country_key']), ('dim_quality_of_life', ['country_key']),
+                                    ('fact_country_metrics', ['country_key', 'time_key'])]
+        }
+
+    incremental = warehouse(engine)
+    assert list(incremental['dim_country']['country_name']) == ['Alpha', 'Gamma'], "Beta should be deleted"
+    assert list(incremental['dim_quality_of_life']['country_key']) == [1, 3], "Beta's quality row should be deleted"
+    fact = incremental['fact_country_metrics']
+    assert list(zip(fact['country_key'], fact['time_key'])) == [(1, 2020), (1, 2021), (1, 2022), (3, 2022)], \
+        "Fact rows should match the sources"
+    assert float(fact.loc[2, 'gdp_usd']) == 4800, "Alpha's 2022 GDP should be updated"
+
+    # Same warehouse as a full reload of the same sources
+    reloaded = create_pooled_engine(url, poolclass=StaticPool)
+    load(tables, reloaded, refresh_mode='full', summaries=False)
+    for table, df in warehouse(reloaded).items():
+        pd.testing.assert_frame_equal(incremental[table], df, check_dtype=False, obj=table)
+
+
 # --- Test Runner ---
 def run_all_tests():
     print("🚀 Starting Functional Test Suite")
     print("=" * 60)
 
-    if not verify_connection():
-        print("❌ Cannot continue without database connection.")
-        return
+    # Synthetic regression tests run on the embedded backends, even without the warehouse
+    for backend, url in EMBEDDED_URLS.items():
+        test_fanout_regression_live_queries(f"Fan-out Regression (live queries, {backend})", url)
+        test_fanout_regression_summary_tables(f"Fan-out Regression (summary tables, {backend})", url)
+        test_streamed_compact_reads(f"Streamed Compact Reads ({backend})", url)
+        test_incremental_refresh(f"Incremental Refresh ({backend})", url)
+        test_report_filters(f"Report Filters ({backend})", url)
+        test_report_filters_summary_vs_live(f"Report Filters, Summary vs Live ({backend})", url)
+        test_report_columns(f"Report Column Projection ({backend})", url)
 
-    # Each test runs independently, time is tracked
-    test_report_functions_availability("Report Functions Availability")
-    test_gdp_population_correlation("GDP vs Population Correlation")
-    test_cost_of_living_vs_purchasing_power("Cost of Living vs Purchasing Power")
-    test_climate_quality_vs_economic_development("Climate Quality vs Economic Development")
-    test_traffic_commute_category("Traffic Commute Category Report")
+    if verify_connection():
+        # Each test runs independently, time is tracked
+        test_report_functions_availability("Report Functions Availability")
+        test_gdp_population_correlation("GDP vs Population Correlation")
+        test_cost_of_living_vs_purchasing_power("Cost of Living vs Purchasing Power")
+        test_climate_quality_vs_economic_development("Climate Quality vs Economic Development")
+        test_traffic_commute_category("Traffic Commute Category Report")
+    else:
+        print("❌ Skipping warehouse tests without database connection.\n")
 
     # --- Summary Table ---
     print("=" * 60)
@@ -148,6 +373,8 @@ def run_all_tests():
     passed = sum(1 for r in test_results if r["Result"] == "PASS")
     failed = len(test_results) - passed
     print(f" Passed: {passed} |  Failed: {failed}")
+    print("\n Slowest queries and reports:")
+    print_metrics()
     print(" Functional testing complete!\n")
 
 
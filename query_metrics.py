@@ -0,0 +1,181 @@
+import atexit
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+from sqlalchemy import event
+
+# --- Query instrumentation ---
+# Every engine made by db.py times each SQL statement it executes; report
+# calls (reports.py) are timed as a whole and split into database time and
+# the rest (fetching rows and building the DataFrame in pandas). Timings are
+# kept per (kind, label) in an in-memory histogram:
+#   kind 'sql'      one statement; label is the report or ETL stage running
+#                   it, or the statement's verb and table outside of those;
+#                   rows = rows written (drivers give no count for reads, so
+#                   read-only series show no rows rather than 0)
+#   kind 'report'   one report call, rows = rows of the returned DataFrame
+#   kind 'pandas'   the part of a report call not spent executing SQL
+# Set QUERY_METRICS=0 to leave engines uninstrumented, QUERY_METRICS_FILE to
+# dump the histograms as JSON when the process exits.
+QUERY_METRICS = os.environ.get('QUERY_METRICS', '1') != '0'
+QUERY_METRICS_FILE = os.environ.get('QUERY_METRICS_FILE', '')
+
+# Histogram bucket upper bounds in seconds (Prometheus' defaults)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_series = {}  # (kind, label) -> {'count', 'seconds', 'max_seconds', 'rows' (None if unknown), 'buckets'}
+_lock = threading.Lock()
+
+# The report or ETL stage running on this thread, and its database time so far
+_label = contextvars.ContextVar('query_label', default=None)
+_database_seconds = contextvars.ContextVar('query_database_seconds', default=None)
+
+
+def observe(kind, label, seconds, rows=None):
+    """Record one timing (and optional row count) in the (kind, label) histogram."""
+    with _lock:
+        series = _series.get((kind, label))
+        if series is None:
+            series = _series[(kind, label)] = {
+                'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'rows': None, 'buckets': [0] * len(BUCKETS),
+            }
+        series['count'] += 1
+        series['seconds'] += seconds
+        series['max_seconds'] = max(series['max_seconds'], seconds)
+        if rows is not None and rows >= 0:
+            series['rows'] = (series['rows'] or 0) + rows
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                series['buckets'][i] += 1
+                break
+
+def statement_label(statement):
+    """'SELECT dim_country', 'INSERT fact_country_metrics', ... for statement."""
+    verb = statement.split(None, 1)[0].upper() if statement.strip() else ''
+    table = re.search(r'\b(?:FROM|INTO|TABLE(?: IF (?:NOT )?EXISTS)?|UPDATE)\s+`?(\w+)', statement, re.I)
+    return f"{verb} {table.group(1)}" if table else verb
+
+@contextlib.contextmanager
+def query_label(label):
+    """Attribute the statements run inside the block to label."""
+    token = _label.set(label)
+    try:
+        yield
+    finally:
+        _label.reset(token)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - context._query_start
+    database_seconds = _database_seconds.get()
+    if database_seconds is not None:
+        database_seconds[0] += seconds
+    # rowcount is the rows written; drivers report -1 for SELECTs, which are
+    # left without a row count (reads are counted per report instead)
+    observe('sql', _label.get() or statement_label(statement), seconds, cursor.rowcount)
+
+def instrument_engine(engine):
+    """Time every statement engine executes (does nothing with QUERY_METRICS=0)."""
+    if QUERY_METRICS and not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    return engine
+
+def timed_report(report):
+    """Decorator recording a report's total, database and pandas time and rows.
+
+    Streamed (chunksize) results are timed per statement only.
+    """
+    name = report.__name__
+
+    @functools.wraps(report)
+    def wrapper(*args, **kwargs):
+        label_token = _label.set(name)
+        seconds_token = _database_seconds.set([0.0])
+        start = time.perf_counter()
+        try:
+            result = report(*args, **kwargs)
+            if isinstance(result, pd.DataFrame):
+                elapsed = time.perf_counter() - start
+                observe('report', name, elapsed, len(result))
+                observe('pandas', name, max(0.0, elapsed - _database_seconds.get()[0]))
+            return result
+        finally:
+            _database_seconds.reset(seconds_token)
+            _label.reset(label_token)
+    return wrapper
+
+
+# --- Export ---
+def snapshot():
+    """The histograms as a list of plain dicts, slowest total time first."""
+    with _lock:
+        rows = [{'kind': kind, 'label': label, **series, 'buckets': list(series['buckets'])}
+                for (kind, label), series in _series.items()]
+    for row in rows:
+        row['mean_seconds'] = row['seconds'] / row['count']
+        row['bucket_bounds'] = list(BUCKETS)
+    return sorted(rows, key=lambda row: row['seconds'], reverse=True)
+
+def reset_metrics():
+    with _lock:
+        _series.clear()
+
+def dump_json(path=QUERY_METRICS_FILE):
+    """Write snapshot() to path as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'generated_at': time.time(), 'series': snapshot()}, f, indent=2)
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_text():
+    """The histograms in the Prometheus text exposition format."""
+    lines = [
+        '# HELP query_duration_seconds SQL statement, report and pandas time.',
+        '# TYPE query_duration_seconds histogram',
+    ]
+    series = snapshot()
+    for row in series:
+        labels = f'kind="{row["kind"]}",label="{_escape(row["label"])}"'
+        cumulative = 0
+        for bound, count in zip(BUCKETS, row['buckets']):
+            cumulative += count
+            lines.append(f'query_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'query_duration_seconds_bucket{{{labels},le="+Inf"}} {row["count"]}')
+        lines.append(f'query_duration_seconds_sum{{{labels}}} {row["seconds"]}')
+        lines.append(f'query_duration_seconds_count{{{labels}}} {row["count"]}')
+    lines += [
+        '# HELP query_rows_total Rows written by statements and returned by reports.',
+        '# TYPE query_rows_total counter',
+    ]
+    for row in series:
+        if row['rows'] is not None:
+            lines.append(f'query_rows_total{{kind="{row["kind"]}",label="{_escape(row["label"])}"}} {row["rows"]}')
+    return '\n'.join(lines) + '\n'
+
+def register_metrics_endpoint(server, path='/metrics'):
+    """Serve prometheus_text() at path on a Flask server (Dash's app.server)."""
+    def metrics():
+        return prometheus_text(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+    server.add_url_rule(path, 'query_metrics', metrics)
+
+def print_metrics(limit=10):
+    """Print the slowest (kind, label) series by total time."""
+    print(f"  {'kind':<7} {'label':<48} {'count':>6} {'total s':>9} {'mean ms':>9} {'max ms':>9} {'rows':>9}")
+    for row in snapshot()[:limit]:
+        rows = '-' if row['rows'] is None else f"{row['rows']:,}"
+        print(f"  {row['kind']:<7} {row['label'][:48]:<48} {row['count']:>6} {row['seconds']:9.3f} "
+              f"{row['mean_seconds'] * 1000:9.2f} {row['max_seconds'] * 1000:9.2f} {rows:>9}")
+
+if QUERY_METRICS_FILE:
+    atexit.register(dump_json)
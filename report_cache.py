@@ -0,0 +1,194 @@
+import functools
+import hashlib
+import inspect
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+from sqlalchemy import text
+
+try:
+    import pyarrow.parquet  # pandas' Parquet engine
+except ImportError:  # the on-disk tier is optional
+    pyarrow = None
+
+# --- Report result cache ---
+# Report results are keyed on report name + arguments + the warehouse (a hash
+# of its URL) + the load version and per-load token that the ETL writes to
+# etl_load_version after every load, so an entry stays valid exactly until
+# the data changes, and a recreated or different warehouse whose version
+# counter restarted never matches it.
+REPORT_CACHE_ENTRIES = int(os.environ.get('REPORT_CACHE_ENTRIES', '64'))
+REPORT_CACHE_MAX_BYTES = int(os.environ.get('REPORT_CACHE_MAX_MB', '256')) * 1024 * 1024
+# Parquet files survive dashboard restarts and test runs; set
+# REPORT_CACHE_DIR= (empty) to keep the cache in memory only.
+REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR', '.report_cache')
+
+
+def warehouse_key(engine):
+    """Short hash identifying the warehouse engine connects to."""
+    return hashlib.sha256(engine.url.render_as_string(hide_password=True).encode()).hexdigest()[:12]
+
+def load_version(engine):
+    """Current warehouse load as 'version-token', or None if the ETL never
+    recorded one.
+    """
+    try:
+        with engine.connect() as connection:
+            row = connection.execute(text(
+                "SELECT * FROM etl_load_version WHERE version_id = 1"
+            )).mappings().fetchone()
+    except Exception:
+        return None
+    if row is None:
+        return None
+    # Loads recorded before load_token existed fall back to their timestamp
+    token = row.get('load_token') or re.sub(r'\W', '', str(row['loaded_at']))
+    return f"{row['load_version']}-{token}"
+
+# --- In-memory LRU ---
+# Shared by this cache and figure_cache.py. Keys are (name, warehouse, load
+# version, detail); storing an entry drops that name's entries from older
+# loads of the same warehouse, as the on-disk tiers do, so memory is freed
+# as soon as a new load is seen.
+
+def memory_cache(max_entries, max_bytes=None):
+    """New empty LRU holding at most max_entries values and, when given,
+    max_bytes bytes in total.
+    """
+    return {'entries': OrderedDict(), 'bytes': 0, 'max_entries': max_entries,
+            'max_bytes': max_bytes, 'lock': threading.Lock()}
+
+def remember(cache, key, value, size=0):
+    """Store value (size bytes) under key, evicting least recently used
+    entries beyond the limits; values larger than the whole cache are skipped.
+    """
+    max_bytes = cache['max_bytes']
+    if max_bytes is not None and size > max_bytes:
+        return
+    name, warehouse, version = key[:3]
+    with cache['lock']:
+        entries = cache['entries']
+        replaced = [k for k in entries if k == key or (k[:2] == (name, warehouse) and k[2] != version)]
+        for k in replaced:
+            cache['bytes'] -= entries.pop(k)[1]
+        entries[key] = (value, size)
+        cache['bytes'] += size
+        while len(entries) > cache['max_entries'] or (max_bytes is not None and cache['bytes'] > max_bytes):
+            cache['bytes'] -= entries.popitem(last=False)[1][1]
+
+def recall(cache, key):
+    """Return the value stored under key, or None on a miss."""
+    with cache['lock']:
+        entry = cache['entries'].get(key)
+        if entry is None:
+            return None
+        cache['entries'].move_to_end(key)
+        return entry[0]
+
+def forget_all(cache):
+    """Drop every entry."""
+    with cache['lock']:
+        cache['entries'].clear()
+        cache['bytes'] = 0
+
+_memory = memory_cache(REPORT_CACHE_ENTRIES, REPORT_CACHE_MAX_BYTES)  # key -> DataFrame
+
+def params_digest(arguments):
+    """Digest of a call's bound arguments, defaults included."""
+    params = repr(sorted(arguments.items()))
+    return hashlib.sha256(params.encode()).hexdigest()[:16]
+
+def _frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+def _disk_path(cache_dir, name, warehouse, version, digest):
+    return os.path.join(cache_dir, f"{name}.{warehouse}.v{version}.{digest}.parquet")
+
+def read_disk(cache_dir, name, warehouse, version, digest):
+    """Return the Parquet copy of a report result, or None on a miss."""
+    path = _disk_path(cache_dir, name, warehouse, version, digest)
+    if pyarrow is None or not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except ValueError:
+        # pandas cannot restore Arrow dictionary columns (dtypes='arrow')
+        # from the Parquet metadata; those frames are Arrow-backed throughout
+        return pyarrow.parquet.read_table(path).to_pandas(types_mapper=pd.ArrowDtype)
+
+def write_disk(cache_dir, name, warehouse, version, digest, df):
+    """Store a report result and drop that report's files from older loads
+    of the same warehouse.
+    """
+    if pyarrow is None:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _disk_path(cache_dir, name, warehouse, version, digest)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"WARNING: could not cache report {name} ({e})")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    warehouse_prefix = f"{name}.{warehouse}.v"
+    current = f"{warehouse_prefix}{version}."
+    for entry in os.scandir(cache_dir):
+        if entry.name.startswith(warehouse_prefix) and not entry.name.startswith(current):
+            os.remove(entry.path)
+
+def clear_report_cache(cache_dir=REPORT_CACHE_DIR):
+    """Empty the in-memory cache and delete the Parquet files."""
+    forget_all(_memory)
+    if cache_dir and os.path.isdir(cache_dir):
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith(('.parquet', '.tmp')):
+                os.remove(entry.path)
+
+def cached_report(engine, cache_dir=REPORT_CACHE_DIR):
+    """Decorator caching a report function's DataFrame per warehouse and load.
+
+    Each call costs one primary-key lookup of the load version; results are
+    served from memory, then from Parquet, and only then from the warehouse.
+    Callers get a copy, so they may modify the frame freely.
+    """
+    warehouse = warehouse_key(engine)
+
+    def decorator(report):
+        name = report.__name__
+        signature = inspect.signature(report)
+
+        @functools.wraps(report)
+        def wrapper(*args, **kwargs):
+            # Positional and keyword calls bind to the same arguments
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            # Streamed results are read straight from the warehouse
+            if bound.arguments.get('chunksize'):
+                return report(*args, **kwargs)
+            version = load_version(engine)
+            if version is None:
+                return report(*args, **kwargs)
+
+            digest = params_digest(bound.arguments)
+            key = (name, warehouse, version, digest)
+            df = recall(_memory, key)
+            if df is None and cache_dir:
+                df = read_disk(cache_dir, name, warehouse, version, digest)
+                if df is not None:
+                    remember(_memory, key, df, _frame_bytes(df))
+            if df is None:
+                df = report(*args, **kwargs)
+                remember(_memory, key, df, _frame_bytes(df))
+                if cache_dir:
+                    write_disk(cache_dir, name, warehouse, version, digest, df)
+            return df.copy()
+
+        wrapper.uncached = report
+        return wrapper
+    return decorator
@@ -1,15 +1,179 @@
 import pandas as pd
-from sqlalchemy import create_engine, text
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import bindparam, inspect, text
 
-dw_username = "root"
-dw_password = "password"
-dw_host = "localhost"
-dw_database = "country_data_warehouse"
-dw_engine = create_engine(f'mysql+pymysql://{dw_username}:{dw_password}@{dw_host}/{dw_database}')
+try:
+    import pyarrow
+except ImportError:  # only needed for dtypes='arrow'
+    pyarrow = None
 
+from db import MAX_OVERFLOW, POOL_SIZE, get_engine
+from query_metrics import timed_report
+from report_cache import cached_report
 
-def gdp_population_correlation_report():
-    query = text("""
+# Shared, pooled warehouse engine (connection settings in db.py)
+dw_engine = get_engine()
+# Results are reused until the next ETL load (see report_cache.py)
+report_cache = cached_report(dw_engine)
+
+
+def report(function):
+    """Decorator for the report functions: cached per load version and
+    timed per call, cache hits included (query_metrics.py).
+    """
+    return timed_report(report_cache(function))
+
+
+def summary_available(table):
+    """True once the ETL has built the given summary_* table (etl/summaries.py)."""
+    return inspect(dw_engine).has_table(table)
+
+
+# --- Report filters ---
+# Every report takes optional filters that are compiled into bound
+# parameters and pushed into the query's WHERE clauses:
+#   year_range  (first, last) year, inclusive
+#   countries   list of country names as stored in dim_country
+#   region      region name from dim_region, e.g. 'Europe'
+#   category    one value or a list of values of the report's category column
+# and `columns`, the measures to fetch (default: all of them).
+#
+# How the result is read:
+#   dtypes      None (pandas defaults), 'compact' (keys Int32, years Int16,
+#               names and categories as the `category` dtype) or 'arrow'
+#               (the compact types, Arrow-backed; needs pyarrow)
+#   chunksize   stream the result: the report returns an iterator of
+#               DataFrames of at most chunksize rows, read through a
+#               server-side cursor and never cached, so memory stays bounded
+#               however many years and countries the report covers
+# Nullable integer types, so that every chunk of a stream (rollup rows or
+# not) gets the same dtype
+COMPACT_DTYPES = {
+    'time_key': 'Int32',
+    'year_value': 'Int16',
+    'sort_order': 'Int8',
+    'country_name': 'category',
+    'region': 'category',
+    'traffic_commute_category': 'category',
+}
+
+def bind_filters(year_range=None, countries=None, region=None, category=None):
+    """Bound parameters for the filters that are set."""
+    params = {}
+    if year_range is not None:
+        params['year_from'], params['year_to'] = year_range
+    if countries is not None:
+        params['countries'] = list(countries)
+    if region is not None:
+        params['region'] = region
+    if category is not None:
+        params['category'] = [category] if isinstance(category, str) else list(category)
+    return params
+
+def filter_clauses(params, year=None, country=None, region=None, category=None):
+    """Conditions for the filters in params, applied to the given columns."""
+    clauses = []
+    if year and 'year_from' in params:
+        clauses.append(f"{year} BETWEEN :year_from AND :year_to")
+    if country and 'countries' in params:
+        clauses.append(f"{country} IN :countries")
+    if region and 'region' in params:
+        clauses.append(f"{region} IN (SELECT region_key FROM dim_region WHERE region_name = :region)")
+    if category and 'category' in params:
+        clauses.append(f"{category} IN :category")
+    return clauses
+
+def country_key_clause(params, column):
+    """Condition limiting column (a country_key) to the countries and region
+    filters, so fact rows are filtered before they are aggregated.
+    """
+    clauses = filter_clauses(params, country='country_name', region='region_key')
+    return f"{column} IN (SELECT country_key FROM dim_country {where(*clauses)})" if clauses else ""
+
+def where(*clauses):
+    clauses = [c for c in clauses if c]
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+def compact_frame(df, dtypes):
+    """Cast df's columns to the dtypes='compact' or 'arrow' types."""
+    if dtypes is None:
+        return df
+    if dtypes not in ('compact', 'arrow'):
+        raise ValueError(f"Unknown dtypes {dtypes!r}; choose from None, 'compact', 'arrow'")
+    if dtypes == 'arrow' and pyarrow is None:
+        raise ValueError("dtypes='arrow' needs pyarrow")
+
+    casts = {}
+    for column, dtype in COMPACT_DTYPES.items():
+        if column not in df.columns:
+            continue
+        if dtypes == 'arrow':
+            dtype = (pd.ArrowDtype(pyarrow.dictionary(pyarrow.int32(), pyarrow.string()))
+                     if dtype == 'category' else f'{dtype.lower()}[pyarrow]')
+        casts[column] = dtype
+    if dtypes == 'arrow':
+        # The measures keep their type, moved to Arrow
+        for column in df.columns.difference(list(casts)):
+            dtype = df[column].dtype
+            casts[column] = (pd.ArrowDtype(pyarrow.from_numpy_dtype(dtype)) if dtype.kind in 'biuf'
+                             else 'string[pyarrow]')
+    return df.astype(casts)
+
+def stream_report(engine, statement, params, chunksize, dtypes):
+    """Yield the result of statement in DataFrames of at most chunksize rows."""
+    with engine.connect() as connection:
+        connection = connection.execution_options(stream_results=True, max_row_buffer=chunksize)
+        for chunk in pd.read_sql(statement, connection, params=params, chunksize=chunksize):
+            yield compact_frame(chunk, dtypes)
+
+def run_report(query, params, report_columns, measures, columns, order_by, chunksize=None, dtypes=None):
+    """Fetch the key columns plus the requested measures of query, ordered;
+    an iterator of chunks when chunksize is set.
+    """
+    if columns is None:
+        selected = report_columns
+    else:
+        unknown = set(columns) - set(measures)
+        if unknown:
+            raise ValueError(f"Unknown report columns {sorted(unknown)}; choose from {measures}")
+        selected = [c for c in report_columns if c not in measures or c in columns]
+
+    statement = text(f"SELECT {', '.join(selected)} FROM ({query}) report ORDER BY {order_by}")
+    expanding = [bindparam(name, expanding=True) for name in ('countries', 'category') if name in params]
+    if expanding:
+        statement = statement.bindparams(*expanding)
+    if chunksize:
+        return stream_report(dw_engine, statement, params, chunksize, dtypes)
+    return compact_frame(pd.read_sql(statement, dw_engine, params=params), dtypes)
+
+
+@report
+def gdp_population_correlation_report(year_range=None, countries=None, region=None, category=None, columns=None,
+                                      chunksize=None, dtypes=None):
+    """Population and GDP of every country in the latest year (within
+    year_range) that has both; category is the quality of life category.
+    """
+    params = bind_filters(year_range, countries, region, category)
+    report_columns = ['country_name', 'population', 'gdp_usd', 'time_key']
+    measures = ['population', 'gdp_usd']
+
+    # The snapshot is fixed to the overall latest year
+    if summary_available('summary_latest_year') and year_range is None:
+        query = f"""
+            SELECT country_name, population, gdp_usd, time_key
+            FROM summary_latest_year
+            {where(*filter_clauses(params, country='country_name', region='region_key',
+                                   category='quality_of_life_category'))}
+        """
+        return run_report(query, params, report_columns, measures, columns, 'time_key', chunksize, dtypes)
+
+    # time_key is the calendar year, so the range prunes fact partitions
+    latest_year = f"""(
+            SELECT MAX(f2.time_key)
+            FROM fact_country_metrics f2
+            {where('f2.gdp_usd > 0 AND f2.population > 0', *filter_clauses(params, year='f2.time_key'))}
+        )"""
+    query = f"""
         SELECT 
             c.country_name, 
             f.population,  
@@ -17,39 +181,146 @@ def gdp_population_correlation_report():
             f.time_key
         FROM fact_country_metrics f
         JOIN dim_country c ON f.country_key = c.country_key
-        WHERE f.time_key = (
-            SELECT MAX(f2.time_key)
-            FROM fact_country_metrics f2
-            WHERE f2.gdp_usd > 0 AND f2.population > 0
-        )
-        ORDER BY f.time_key;
-    """)
-    df = pd.read_sql(query, dw_engine)
+        {where(f'f.time_key = {latest_year}', *filter_clauses(
+            params, country='c.country_name', region='c.region_key',
+            category='(SELECT q.quality_of_life_category FROM dim_quality_of_life q WHERE q.country_key = f.country_key)'))}
+    """
+    df = run_report(query, params, report_columns, measures, columns, 'time_key', chunksize, dtypes)
     return df
 
 
-def cost_of_living_vs_purchasing_power_report():
-    query = text("""
+# Rollup of the per country-year `detail` rows: per-year subtotals, then a
+# grand total that weighs each country once (quality is country-grain).
+# The grand total is left out when there are no detail rows; WHERE EXISTS
+# rather than HAVING without GROUP BY, which SQLite only accepts from 3.39.
+COST_OF_LIVING_ROLLUP = """
     SELECT 
-        t.year_value,
-        c.country_name,
-        AVG(q.cost_of_living_value) AS avg_cost_of_living,
-        AVG(q.purchasing_power_value) AS avg_purchasing_power,
-        ROUND(AVG(q.cost_of_living_value) / NULLIF(AVG(q.purchasing_power_value), 0), 2) AS avg_inflation_pressure_ratio
+        year_value,
+        country_name,
+        avg_cost_of_living,
+        avg_purchasing_power,
+        ROUND(avg_cost_of_living / NULLIF(avg_purchasing_power, 0), 2) AS avg_inflation_pressure_ratio
+    FROM detail
+    UNION ALL
+    SELECT 
+        year_value,
+        NULL,
+        AVG(avg_cost_of_living),
+        AVG(avg_purchasing_power),
+        ROUND(AVG(avg_cost_of_living) / NULLIF(AVG(avg_purchasing_power), 0), 2)
+    FROM detail
+    GROUP BY year_value
+    UNION ALL
+    SELECT 
+        NULL,
+        NULL,
+        avg_cost_of_living,
+        avg_purchasing_power,
+        ROUND(avg_cost_of_living / NULLIF(avg_purchasing_power, 0), 2)
+    FROM (
+        SELECT AVG(avg_cost_of_living) AS avg_cost_of_living,
+            AVG(avg_purchasing_power) AS avg_purchasing_power
+        FROM (
+            SELECT country_name,
+                MAX(avg_cost_of_living) AS avg_cost_of_living,
+                MAX(avg_purchasing_power) AS avg_purchasing_power
+            FROM detail
+            GROUP BY country_name
+        ) per_country
+    ) total
+    WHERE EXISTS (SELECT 1 FROM detail)
+"""
+
+@report
+def cost_of_living_vs_purchasing_power_report(year_range=None, countries=None, region=None, category=None,
+                                              columns=None, chunksize=None, dtypes=None):
+    """Cost of living and purchasing power per country and year, with
+    per-year and overall rollup rows (country_name / year_value NULL);
+    category is the cost of living category.
+    """
+    params = bind_filters(year_range, countries, region, category)
+    report_columns = ['year_value', 'country_name', 'avg_cost_of_living', 'avg_purchasing_power',
+                      'avg_inflation_pressure_ratio']
+    measures = report_columns[2:]
+
+    if summary_available('summary_country_year'):
+        query = f"""
+        WITH detail AS (
+            SELECT year_value, country_name, avg_cost_of_living, avg_purchasing_power
+            FROM summary_country_year
+            {where(*filter_clauses(params, year='year_value', country='country_name', region='region_key',
+                                   category='cost_of_living_category'))}
+        )
+        {COST_OF_LIVING_ROLLUP}
+        """
+        return run_report(query, params, report_columns, measures, columns, 'year_value, country_name',
+                          chunksize, dtypes)
+
+    # Quality attributes are country-grain: average them once per country and
+    # join them to the distinct country-years, so the grand total weighs each
+    # country once instead of once per year of history.
+    query = f"""
+    WITH quality AS (
+        SELECT country_key,
+            AVG(cost_of_living_value) AS cost_of_living_value,
+            AVG(purchasing_power_value) AS purchasing_power_value
+        FROM dim_quality_of_life
+        {where(*filter_clauses(params, category='cost_of_living_category'))}
+        GROUP BY country_key
+    ),
+    country_year AS (
+        SELECT f.country_key, t.year_value
         FROM fact_country_metrics f
-    JOIN dim_country c ON f.country_key = c.country_key
-    JOIN dim_time t ON f.time_key = t.time_key
-    JOIN dim_quality_of_life q ON f.country_key = q.country_key
-    GROUP BY t.year_value, c.country_name WITH ROLLUP
-    ORDER BY t.year_value, c.country_name;   
-    """)
-    df = pd.read_sql(query, dw_engine)
+        JOIN dim_time t ON f.time_key = t.time_key
+        {where(*filter_clauses(params, year='f.time_key'), country_key_clause(params, 'f.country_key'))}
+        GROUP BY f.country_key, t.year_value
+    ),
+    detail AS (
+        SELECT 
+            cy.year_value,
+            c.country_name,
+            AVG(q.cost_of_living_value) AS avg_cost_of_living,
+            AVG(q.purchasing_power_value) AS avg_purchasing_power
+        FROM country_year cy
+        JOIN dim_country c ON cy.country_key = c.country_key
+        JOIN quality q ON cy.country_key = q.country_key
+        GROUP BY cy.year_value, c.country_name
+    )
+    {COST_OF_LIVING_ROLLUP}
+    """
+    df = run_report(query, params, report_columns, measures, columns, 'year_value, country_name',
+                    chunksize, dtypes)
     
     return df
 
-def climate_quality_vs_economic_development_report():
+@report
+def climate_quality_vs_economic_development_report(year_range=(2020, 2025), countries=None, region=None,
+                                                   category=None, columns=None, chunksize=None, dtypes=None):
+    """Climate quality against GDP per country and year; category is the
+    climate category.
+    """
     #OLAP USED: SLICE
-    query = text("""
+    params = bind_filters(year_range, countries, region, category)
+    report_columns = ['country_name', 'year_value', 'climate_quality_2025', 'total_gdp_usd',
+                      'development_efficiency_ratio']
+    measures = report_columns[2:]
+
+    if summary_available('summary_country_year'):
+        query = f"""
+        SELECT
+            country_name,
+            year_value,
+            climate_value AS climate_quality_2025,
+            total_gdp_usd,
+            development_efficiency_ratio
+        FROM summary_country_year
+        {where(*filter_clauses(params, year='year_value', country='country_name', region='region_key',
+                               category='climate_category'))}
+        """
+        return run_report(query, params, report_columns, measures, columns, 'year_value, country_name',
+                          chunksize, dtypes)
+
+    query = f"""
     SELECT 
         c.country_name,
         t.year_value,
@@ -60,18 +331,48 @@ def climate_quality_vs_economic_development_report():
     JOIN dim_country c ON f.country_key = c.country_key
     JOIN dim_time t ON f.time_key = t.time_key
     JOIN dim_quality_of_life q ON f.country_key = q.country_key
-    WHERE t.year_value BETWEEN 2020 AND 2025
+    {where(*filter_clauses(params, year='f.time_key', country='c.country_name', region='c.region_key',
+                           category='q.climate_category'))}
     GROUP BY c.country_name, t.year_value
-    ORDER BY t.year_value, c.country_name; 
-    """)
-    df = pd.read_sql(query, dw_engine)
+    """
+    df = run_report(query, params, report_columns, measures, columns, 'year_value, country_name',
+                    chunksize, dtypes)
     
     return df
 
-def traffic_commute_category_report():
-    query = text("""
+@report
+def traffic_commute_category_report(year_range=None, countries=None, region=None, category=None, columns=None,
+                                    chunksize=None, dtypes=None):
+    """GDP per capita and population per traffic commute category (also the
+    category filter).
+    """
+    params = bind_filters(year_range, countries, region, category)
+    report_columns = ['traffic_commute_category', 'avg_gdp_per_capita', 'total_population', 'sort_order']
+    measures = ['avg_gdp_per_capita', 'total_population']
+
+    # The summary has no country or year grain left to filter on
+    if summary_available('summary_category') and year_range is None and countries is None and region is None:
+        query = f"""
+        SELECT traffic_commute_category, avg_gdp_per_capita, total_population, sort_order
+        FROM summary_category
+        {where(*filter_clauses(params, category='traffic_commute_category'))}
+        """
+        return run_report(query, params, report_columns, measures, columns, 'sort_order', chunksize, dtypes)
+
+    # Pre-aggregate the fact to one row per country (mean GDP per capita and
+    # the latest year with a population) before joining the country-grain
+    # category, so population is not summed across years.
+    query = f"""
+    WITH country_fact AS (
+        SELECT f.country_key,
+            AVG(f.gdp_per_capita) AS avg_gdp_per_capita,
+            MAX(CASE WHEN f.population > 0 THEN f.time_key END) AS latest_time_key
+        FROM fact_country_metrics f
+        {where(*filter_clauses(params, year='f.time_key'), country_key_clause(params, 'f.country_key'))}
+        GROUP BY f.country_key
+    )
     SELECT q.traffic_commute_category,
-       AVG(f.gdp_per_capita) AS avg_gdp_per_capita,
+       AVG(cf.avg_gdp_per_capita) AS avg_gdp_per_capita,
        SUM(f.population) AS total_population,
        CASE 
            WHEN q.traffic_commute_category LIKE '%Very High%' THEN 1
@@ -81,151 +382,49 @@ def traffic_commute_category_report():
            WHEN q.traffic_commute_category LIKE '%Very Low%' THEN 5
            ELSE 6
        END AS sort_order
-FROM fact_country_metrics f
-JOIN dim_quality_of_life q ON f.country_key = q.country_key
+FROM country_fact cf
+JOIN dim_quality_of_life q ON cf.country_key = q.country_key
+LEFT JOIN fact_country_metrics f ON f.country_key = cf.country_key AND f.time_key = cf.latest_time_key
+{where(*filter_clauses(params, category='q.traffic_commute_category'))}
 GROUP BY q.traffic_commute_category
-ORDER BY sort_order;
-
-    """)
-    df = pd.read_sql(query, dw_engine)
+    """
+    df = run_report(query, params, report_columns, measures, columns, 'sort_order', chunksize, dtypes)
     
     return df
 
-def quality_of_life_by_region_report():
-    query = text("""
-        SELECT 
-            CASE
-                -- Africa
-                WHEN c.country_name IN (
-                    'Algeria','Angola','Benin','Botswana','Burkina Faso','Burundi',
-                    'Cabo Verde','Cameroon','Central African Republic','Chad','Comoros',
-                    'Congo, Dem. Rep.','Congo, Rep.','Cote D''Ivoire','Djibouti','Egypt, Arab Rep.',
-                    'Equatorial Guinea','Eritrea','Eswatini','Ethiopia','Gabon','Gambia, The',
-                    'Ghana','Guinea','Guinea-Bissau','Kenya','Lesotho','Liberia','Libya',
-                    'Madagascar','Malawi','Mali','Mauritania','Mauritius','Morocco','Mozambique',
-                    'Namibia','Niger','Nigeria','Rwanda','Sao Tome And Principe','Senegal',
-                    'Seychelles','Sierra Leone','Somalia','South Africa','South Sudan','Sudan',
-                    'Tanzania','Togo','Tunisia','Uganda','Zambia','Zimbabwe'
-                ) THEN 'Africa'
-
-                -- Asia
-                WHEN c.country_name IN (
-                    'Afghanistan','Armenia','Azerbaijan','Bahrain','Bangladesh','Bhutan',
-                    'Brunei Darussalam','Cambodia','China','Georgia','Hong Kong Sar, China',
-                    'India','Indonesia','Iran, Islamic Rep.','Iraq','Israel','Japan','Jordan',
-                    'Kazakhstan','Korea, Rep.','Kuwait','Kyrgyz Republic','Lao Pdr','Lebanon',
-                    'Malaysia','Maldives','Macao Sar, China','Mongolia','Myanmar','Nepal','Oman',
-                    'Pakistan','Palestine','Philippines','Qatar','Saudi Arabia','Singapore',
-                    'Sri Lanka','Syrian Arab Republic','Tajikistan','Taiwan','Thailand',
-                    'Timor-Leste','Turkmenistan','United Arab Emirates','Uzbekistan','Viet Nam',
-                    'Yemen, Rep.'
-                ) THEN 'Asia'
-
-                -- Oceania
-                WHEN c.country_name IN (
-                    'Australia','Fiji','Kiribati','Marshall Islands','Micronesia, Fed. Sts.',
-                    'Nauru','New Zealand','Palau','Papua New Guinea','Samoa','Solomon Islands',
-                    'Tonga','Tuvalu','Vanuatu'
-                ) THEN 'Oceania'
-
-                -- Europe
-                WHEN c.country_name IN (
-                    'Albania','Andorra','Austria','Belarus','Belgium','Bosnia And Herzegovina',
-                    'Bulgaria','Croatia','Cyprus','Czechia','Denmark','Estonia','Finland','France',
-                    'Germany','Greece','Hungary','Iceland','Ireland','Italy','Kosovo','Latvia',
-                    'Lithuania','Luxembourg','Malta','Moldova','Monaco','Montenegro','Netherlands',
-                    'North Macedonia','Norway','Poland','Portugal','Romania','Russian Federation',
-                    'San Marino','Serbia','Slovak Republic','Slovenia','Spain','Sweden',
-                    'Switzerland','Turkiye','Ukraine','United Kingdom'
-                ) THEN 'Europe'
-
-                -- North America
-                WHEN c.country_name IN (
-                    'Antigua And Barbuda','Aruba','Bahamas, The','Barbados','Belize','Canada',
-                    'Costa Rica','Cuba','Dominica','Dominican Republic','El Salvador','Grenada',
-                    'Guatemala','Haiti','Honduras','Jamaica','Mexico','Nicaragua','Panama',
-                    'Puerto Rico (Us)','St. Kitts And Nevis','St. Lucia',
-                    'St. Vincent And The Grenadines','Trinidad And Tobago','United States'
-                ) THEN 'North America'
-
-                -- South America
-                WHEN c.country_name IN (
-                    'Argentina','Bolivia','Brazil','Chile','Colombia','Ecuador','Guyana',
-                    'Paraguay','Peru','Suriname','Uruguay','Venezuela, Rb'
-                ) THEN 'South America'
-
-                ELSE 'Antarctica'
-            END AS region,
+@report
+def quality_of_life_by_region_report(countries=None, region=None, category=None, columns=None, chunksize=None,
+                                     dtypes=None):
+    """Average quality of life index per region; category is the quality
+    of life category. Quality of life has no time dimension, so there is no
+    year_range filter.
+    """
+    params = bind_filters(None, countries, region, category)
+    report_columns = ['region', 'avg_quality_of_life_index']
+    measures = ['avg_quality_of_life_index']
+    order_by = 'avg_quality_of_life_index DESC'
+
+    if summary_available('summary_region') and countries is None and category is None:
+        query = f"""
+            SELECT region, avg_quality_of_life_index
+            FROM summary_region
+            {where(*filter_clauses(params, region='region_key'))}
+        """
+        return run_report(query, params, report_columns, measures, columns, order_by, chunksize, dtypes)
 
+    # Regions come from dim_region, populated by the ETL (etl/regions.py)
+    query = f"""
+        SELECT 
+            r.region_name AS region,
             ROUND(AVG(q.quality_of_life_value), 2) AS avg_quality_of_life_index
         FROM dim_quality_of_life q
         JOIN dim_country c ON q.country_key = c.country_key
-        GROUP BY 
-            CASE
-                -- Africa
-                WHEN c.country_name IN (
-                    'Algeria','Angola','Benin','Botswana','Burkina Faso','Burundi',
-                    'Cabo Verde','Cameroon','Central African Republic','Chad','Comoros',
-                    'Congo, Dem. Rep.','Congo, Rep.','Cote D''Ivoire','Djibouti','Egypt, Arab Rep.',
-                    'Equatorial Guinea','Eritrea','Eswatini','Ethiopia','Gabon','Gambia, The',
-                    'Ghana','Guinea','Guinea-Bissau','Kenya','Lesotho','Liberia','Libya',
-                    'Madagascar','Malawi','Mali','Mauritania','Mauritius','Morocco','Mozambique',
-                    'Namibia','Niger','Nigeria','Rwanda','Sao Tome And Principe','Senegal',
-                    'Seychelles','Sierra Leone','Somalia','South Africa','South Sudan','Sudan',
-                    'Tanzania','Togo','Tunisia','Uganda','Zambia','Zimbabwe'
-                ) THEN 'Africa'
-
-                -- Asia
-                WHEN c.country_name IN (
-                    'Afghanistan','Armenia','Azerbaijan','Bahrain','Bangladesh','Bhutan',
-                    'Brunei Darussalam','Cambodia','China','Georgia','Hong Kong Sar, China',
-                    'India','Indonesia','Iran, Islamic Rep.','Iraq','Israel','Japan','Jordan',
-                    'Kazakhstan','Korea, Rep.','Kuwait','Kyrgyz Republic','Lao Pdr','Lebanon',
-                    'Malaysia','Maldives','Macao Sar, China','Mongolia','Myanmar','Nepal','Oman',
-                    'Pakistan','Palestine','Philippines','Qatar','Saudi Arabia','Singapore',
-                    'Sri Lanka','Syrian Arab Republic','Tajikistan','Taiwan','Thailand',
-                    'Timor-Leste','Turkmenistan','United Arab Emirates','Uzbekistan','Viet Nam',
-                    'Yemen, Rep.'
-                ) THEN 'Asia'
-
-                -- Oceania
-                WHEN c.country_name IN (
-                    'Australia','Fiji','Kiribati','Marshall Islands','Micronesia, Fed. Sts.',
-                    'Nauru','New Zealand','Palau','Papua New Guinea','Samoa','Solomon Islands',
-                    'Tonga','Tuvalu','Vanuatu'
-                ) THEN 'Oceania'
-
-                -- Europe
-                WHEN c.country_name IN (
-                    'Albania','Andorra','Austria','Belarus','Belgium','Bosnia And Herzegovina',
-                    'Bulgaria','Croatia','Cyprus','Czechia','Denmark','Estonia','Finland','France',
-                    'Germany','Greece','Hungary','Iceland','Ireland','Italy','Kosovo','Latvia',
-                    'Lithuania','Luxembourg','Malta','Moldova','Monaco','Montenegro','Netherlands',
-                    'North Macedonia','Norway','Poland','Portugal','Romania','Russian Federation',
-                    'San Marino','Serbia','Slovak Republic','Slovenia','Spain','Sweden',
-                    'Switzerland','Turkiye','Ukraine','United Kingdom'
-                ) THEN 'Europe'
-
-                -- North America
-                WHEN c.country_name IN (
-                    'Antigua And Barbuda','Aruba','Bahamas, The','Barbados','Belize','Canada',
-                    'Costa Rica','Cuba','Dominica','Dominican Republic','El Salvador','Grenada',
-                    'Guatemala','Haiti','Honduras','Jamaica','Mexico','Nicaragua','Panama',
-                    'Puerto Rico (Us)','St. Kitts And Nevis','St. Lucia',
-                    'St. Vincent And The Grenadines','Trinidad And Tobago','United States'
-                ) THEN 'North America'
-
-                -- South America
-                WHEN c.country_name IN (
-                    'Argentina','Bolivia','Brazil','Chile','Colombia','Ecuador','Guyana',
-                    'Paraguay','Peru','Suriname','Uruguay','Venezuela, Rb'
-                ) THEN 'South America'
-
-                ELSE 'Antarctica'
-            END
-        ORDER BY avg_quality_of_life_index DESC;
-    """)
-    df = pd.read_sql(query, dw_engine)
+        JOIN dim_region r ON c.region_key = r.region_key
+        {where(*filter_clauses(params, country='c.country_name', region='c.region_key',
+                               category='q.quality_of_life_category'))}
+        GROUP BY r.region_key, r.region_name
+    """
+    df = run_report(query, params, report_columns, measures, columns, order_by, chunksize, dtypes)
     return df
 
 
@@ -233,6 +432,20 @@ def quality_of_life_by_region_report():
 
 
 
+def run_reports_concurrently(reports, max_workers=None):
+    """Run several reports in parallel on pooled connections.
+
+    reports maps a name to a report function or to (function, kwargs);
+    returns {name: DataFrame}. Wall time is roughly that of the slowest
+    report. Workers default to what the pool can serve without waiting.
+    """
+    calls = {name: call if isinstance(call, tuple) else (call, {}) for name, call in reports.items()}
+    max_workers = max_workers or max(1, min(len(calls), POOL_SIZE + MAX_OVERFLOW))
+    with ThreadPoolExecutor(max_workers) as pool:
+        futures = {name: pool.submit(function, **kwargs) for name, (function, kwargs) in calls.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
 if __name__ == "__main__":
     df = traffic_commute_category_report()
     print(df.head(5))
\ No newline at end of file